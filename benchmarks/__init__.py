@@ -0,0 +1,3 @@
+"""
+Benchmarks for the Month in Review pipeline on synthetic documents (python -m benchmarks.run)
+"""
@@ -0,0 +1,211 @@
+"""
+Time the Month in Review pipeline on synthetic documents and record the results as JSON
+
+    python -m benchmarks.run                                  # 100 .. 50,000 publications
+    python -m benchmarks.run --sizes 1000 10000 -o after.json --baseline before.json
+
+Each operation is timed best-of-N (repeated until --min-time has passed, at
+most --repeats times), then run once more under tracemalloc for its peak
+memory. Throughput is publications per second; parse and conversion also
+report input megabytes per second.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks.synthetic import build_sections, docx_document, expected_counts, markdown_document
+from mir.convert import convert_docx
+from mir.diff import change_rows, topic_summary
+from mir.docx_export import create_docx_output
+from mir.export import CsvExport, create_markdown_output
+from mir.parser import parse_markdown
+from mir.table import PublicationTable
+from mir.topics import ALL_TOPICS
+
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+VARIANTS = ('plain', 'table')
+# Share of publications whose topics are changed before the export/diff benchmarks
+REVIEW_CHANGE_RATE = 0.2
+
+
+def measure(function, repeats, min_time):
+    """(best seconds, mean seconds, runs, peak traced bytes) for function()."""
+    times = []
+    started = time.perf_counter()
+    while len(times) < repeats:
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+        if time.perf_counter() - started >= min_time:
+            break
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), sum(times) / len(times), len(times), peak
+
+
+def reviewed_table(records, seed):
+    """Table with a REVIEW_CHANGE_RATE share of publications reassigned, as after a review."""
+    table = PublicationTable.from_records(records)
+    rng = random.Random(seed)
+    for index in range(len(table)):
+        if rng.random() < REVIEW_CHANGE_RATE:
+            topics = table.assigned_topics(index)
+            topics.append(rng.choice(ALL_TOPICS))
+            if len(topics) > 2:
+                topics.pop(0)
+            table.set_assigned_topics(index, topics)
+            table.notes[index] = "Reassigned in benchmark"
+    return table
+
+
+def benchmark_size(size, variant, engines, args):
+    """Results for every operation on one synthetic document."""
+    sections = build_sections(size, seed=args.seed)
+    distinct, _ = expected_counts(sections)
+    table_layout = variant == 'table'
+    markdown = markdown_document(sections, table=table_layout)
+    docx = docx_document(sections, table=table_layout)
+
+    records = parse_markdown(markdown)
+    if len(records) != distinct:
+        raise AssertionError(f"parse_markdown found {len(records)} publications, expected {distinct}")
+    # A conversion that silently lost content would otherwise time as a speedup
+    for engine in engines:
+        converted = parse_markdown(convert_docx(docx, engine=engine))
+        if len(converted) != distinct:
+            raise AssertionError(f"convert_{engine} output parses to {len(converted)} publications, "
+                                 f"expected {distinct}")
+    table = reviewed_table(records, args.seed)
+
+    def incremental_csv():
+        # One saved publication on a warm export, as on every Save & Next
+        export.mark_changed(size // 2)
+        export.to_bytes()
+
+    export = CsvExport(table)
+    export.to_bytes()
+
+    operations = [
+        ('parse_markdown', len(markdown.encode('utf-8')), lambda: parse_markdown(markdown)),
+    ]
+    for engine in engines:
+        operations.append((f'convert_{engine}', len(docx),
+                           lambda engine=engine: convert_docx(docx, engine=engine)))
+    operations.extend([
+        ('csv_export', None, lambda: CsvExport(table).to_bytes()),
+        ('csv_export_incremental', None, incremental_csv),
+        ('markdown_export', None, lambda: create_markdown_output(table, ALL_TOPICS)),
+        ('docx_export', None, lambda: create_docx_output(table, ALL_TOPICS)),
+        ('change_diff', None, lambda: (change_rows(table), topic_summary(table))),
+    ])
+
+    results = []
+    for name, input_bytes, function in operations:
+        best, mean, runs, peak = measure(function, args.repeats, args.min_time)
+        result = {
+            'operation': name,
+            'size': size,
+            'variant': variant,
+            'publications': distinct,
+            'best_seconds': best,
+            'mean_seconds': mean,
+            'runs': runs,
+            'publications_per_second': distinct / best if best else None,
+            'peak_memory_bytes': peak,
+        }
+        if input_bytes is not None:
+            result['input_bytes'] = input_bytes
+            result['megabytes_per_second'] = input_bytes / 1e6 / best if best else None
+        results.append(result)
+        print(f"{name:<24} {variant:<6} {size:>7}  {best * 1000:10.2f} ms  "
+              f"{result['publications_per_second']:>12,.0f} pubs/s  {peak / 1e6:8.1f} MB peak",
+              flush=True)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Print the speedup of each result against the same operation in a baseline file."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['operation'], r['size'], r['variant']): r for r in json.load(f)['results']}
+    print(f"\nAgainst {baseline_path} (>1 is faster now):")
+    for result in results:
+        before = baseline.get((result['operation'], result['size'], result['variant']))
+        if before and result['best_seconds']:
+            print(f"{result['operation']:<24} {result['variant']:<6} {result['size']:>7}  "
+                  f"{before['best_seconds'] / result['best_seconds']:6.2f}x  "
+                  f"memory {result['peak_memory_bytes'] / max(before['peak_memory_bytes'], 1):6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="publications per document (default: %(default)s)")
+    parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=VARIANTS)
+    parser.add_argument('--engines', nargs='+', choices=('native', 'pandoc'), default=None,
+                        help="conversion engines to time (default: native, plus pandoc if installed)")
+    parser.add_argument('--repeats', type=int, default=5, help="maximum timed runs per operation")
+    parser.add_argument('--min-time', type=float, default=1.0,
+                        help="stop repeating an operation after this many seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    engines = args.engines
+    if engines is None:
+        engines = ['native']
+        if shutil.which('pandoc'):
+            engines.append('pandoc')
+
+    results = []
+    for size in args.sizes:
+        for variant in args.variants:
+            results.extend(benchmark_size(size, variant, engines, args))
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': args.seed,
+            'engines': engines,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
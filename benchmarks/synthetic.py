@@ -0,0 +1,213 @@
+"""
+Synthetic Month in Review documents, as pandoc-shaped markdown and as .docx
+
+Documents are generated from a seed, so every run (and every commit) sees the
+same input. Features the parser has to cope with in real documents are mixed in
+at fixed rates: titles long enough to wrap over several lines, publications
+repeated under a second topic (duplicate GAO numbers), tracked insertions and
+deletions in titles, and a table-wrapped layout (pandoc grid tables for
+markdown, w:tbl for .docx).
+"""
+import io
+import random
+import textwrap
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+from mir.topics import ALL_TOPICS
+
+WORDS = (
+    "federal agencies should improve oversight of program risk management data "
+    "contract costs defense acquisition health care medicare veterans benefits "
+    "cybersecurity information technology infrastructure transportation grants "
+    "financial management audit tax compliance workforce planning emergency "
+    "response disaster recovery energy environment housing education justice"
+).split()
+
+AUTHORS = ("Reviewer A", "Reviewer B", "Editor")
+TRACKED_DATE = "2026-01-15T09:30:00Z"
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Markdown line width, as pandoc wraps paragraphs
+WRAP_WIDTH = 72
+TABLE_WIDTH = 76
+
+
+class Publication:
+    __slots__ = ('gao_number', 'title', 'date', 'tracked')
+
+    def __init__(self, gao_number, title, date, tracked):
+        self.gao_number = gao_number
+        self.title = title
+        self.date = date
+        # (word index, kind, author) of a tracked change in the title, or None
+        self.tracked = tracked
+
+
+def build_sections(count, seed=0, duplicate_rate=0.1, long_title_rate=0.25, tracked_rate=0.05):
+    """Topic -> publications for a document with count distinct publications.
+
+    A duplicate_rate share of publications is listed again under a second
+    topic; long_title_rate of titles are long enough to wrap; tracked_rate of
+    titles carry a tracked insertion or deletion.
+    """
+    rng = random.Random(seed)
+    sections = {topic: [] for topic in ALL_TOPICS}
+    for number in range(count):
+        words = rng.randint(14, 30) if rng.random() < long_title_rate else rng.randint(4, 10)
+        title = ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+        tracked = None
+        if rng.random() < tracked_rate:
+            # Never the first word: a title must open with bold text to be recognized
+            tracked = (rng.randrange(1, words), rng.choice(('insertion', 'deletion')), rng.choice(AUTHORS))
+        pub = Publication(
+            f"GAO-{rng.randint(20, 26)}-{100000 + number}",
+            title,
+            f"Published: {rng.choice(MONTHS)} {rng.randint(1, 28)}, 2026. "
+            f"Publicly Released: {rng.choice(MONTHS)} {rng.randint(1, 28)}, 2026.",
+            tracked,
+        )
+        topics = rng.sample(ALL_TOPICS, 2)
+        sections[topics[0]].append(pub)
+        if rng.random() < duplicate_rate:
+            sections[topics[1]].append(pub)
+    return {topic: pubs for topic, pubs in sections.items() if pubs}
+
+
+def expected_counts(sections):
+    """(distinct publications, topic assignments) a correct parse should find."""
+    distinct = {pub.gao_number for pubs in sections.values() for pub in pubs}
+    return len(distinct), sum(len(pubs) for pubs in sections.values())
+
+
+# =============================================================================
+# MARKDOWN
+# =============================================================================
+def _markdown_title(pub):
+    words = pub.title.split(' ')
+    if pub.tracked is not None:
+        index, kind, author = pub.tracked
+        words[index] = f'[{words[index]}]{{.{kind} author="{author}" date="{TRACKED_DATE}"}}'
+    return f"**{' '.join(words)}**\\"
+
+
+def _markdown_section(topic, pubs):
+    lines = [f"**{topic.upper()}**\\", "\\"]
+    for pub in pubs:
+        lines.extend(textwrap.wrap(_markdown_title(pub), WRAP_WIDTH, break_long_words=False,
+                                   break_on_hyphens=False))
+        url = f"https://www.gao.gov/products/{pub.gao_number}"
+        lines.extend((f"{pub.gao_number}, {pub.date}", "", f"-   Report: <{url}>", ""))
+    return lines
+
+
+def markdown_document(sections, table=False):
+    """Markdown as pandoc writes it for a Month in Review .docx.
+
+    With table=True every topic section sits in a grid table cell, the layout
+    some issues use; the parser has to strip the | borders, +--- and +=== rules.
+    """
+    out = ["**GAO Month in Review**", "", "Month YYYY\\", "\\", ""]
+    border = '+' + '-' * (TABLE_WIDTH - 2) + '+'
+    for topic, pubs in sections.items():
+        section = _markdown_section(topic, pubs)
+        if not table:
+            out.extend(section)
+            continue
+        out.append(border)
+        for line in section:
+            out.append(f"| {line:<{TABLE_WIDTH - 4}} |")
+        out.append('+' + '=' * (TABLE_WIDTH - 2) + '+')
+        out.append("")
+    return '\n'.join(out) + '\n'
+
+
+# =============================================================================
+# DOCX
+# =============================================================================
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/officeDocument" Target="word/document.xml"/></Relationships>'
+)
+HYPERLINK_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink'
+
+
+def _run(text, bold=False, deleted=False):
+    props = '<w:rPr><w:b/></w:rPr>' if bold else ''
+    tag = 'w:delText' if deleted else 'w:t'
+    return f'<w:r>{props}<{tag} xml:space="preserve">{escape(text)}</{tag}></w:r>'
+
+
+def _docx_title(pub):
+    if pub.tracked is None:
+        return _run(pub.title, bold=True)
+    words = pub.title.split(' ')
+    index, kind, author = pub.tracked
+    before = ' '.join(words[:index]) + (' ' if index else '')
+    after = (' ' if index < len(words) - 1 else '') + ' '.join(words[index + 1:])
+    tag = 'w:ins' if kind == 'insertion' else 'w:del'
+    changed = _run(words[index], bold=True, deleted=kind == 'deletion')
+    runs = [_run(before, bold=True)] if before else []
+    runs.append(f'<{tag} w:id="{index}" w:author={quoteattr(author)} w:date="{TRACKED_DATE}">'
+                f'{changed}</{tag}>')
+    if after:
+        runs.append(_run(after, bold=True))
+    return ''.join(runs)
+
+
+def _docx_section(topic, pubs, links):
+    parts = [f'<w:p>{_run(topic.upper(), bold=True)}<w:r><w:br/></w:r></w:p>']
+    for pub in pubs:
+        links.append(f"https://www.gao.gov/products/{pub.gao_number}")
+        parts.append(
+            f'<w:p>{_docx_title(pub)}<w:r><w:br/></w:r>{_run(f"{pub.gao_number}, {pub.date}")}</w:p>'
+            '<w:p><w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr></w:pPr>'
+            f'{_run("Report: ")}<w:hyperlink r:id="rIdLink{len(links)}">'
+            f'{_run(links[-1])}</w:hyperlink></w:p>'
+        )
+    return ''.join(parts)
+
+
+def docx_document(sections, table=False):
+    """.docx bytes for sections; table=True wraps each topic section in a one-cell table."""
+    links = []
+    body = [f'<w:p>{_run("GAO Month in Review", bold=True)}</w:p><w:p>{_run("Month YYYY")}</w:p>']
+    for topic, pubs in sections.items():
+        section = _docx_section(topic, pubs, links)
+        if table:
+            section = f'<w:tbl><w:tr><w:tc>{section}</w:tc></w:tr></w:tbl>'
+        body.append(section)
+
+    rels = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">']
+    rels.extend(f'<Relationship Id="rIdLink{number}" Type="{HYPERLINK_TYPE}" '
+                f'Target={quoteattr(url)} TargetMode="External"/>'
+                for number, url in enumerate(links, 1))
+    rels.append('</Relationships>')
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', PACKAGE_RELS)
+        archive.writestr('word/_rels/document.xml.rels', ''.join(rels))
+        archive.writestr(
+            'word/document.xml',
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}"><w:body>'
+            + ''.join(body) + '<w:sectPr/></w:body></w:document>'
+        )
+    return buffer.getvalue()
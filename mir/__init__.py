@@ -0,0 +1,4 @@
+"""
+GAO Month in Review - processing helpers shared by the Streamlit app and the
+command line (python -m mir)
+"""
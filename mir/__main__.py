@@ -0,0 +1,3 @@
+from mir.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,258 @@
+"""
+Cross-month archive of parsed and reviewed publications (SQLite + FTS5 title index)
+"""
+import json
+import os
+import re
+import sqlite3
+import time
+
+from mir.store import BatchWriter, connect
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive (
+    id INTEGER PRIMARY KEY,
+    gao_number TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    date TEXT,
+    original_topics TEXT NOT NULL,
+    assigned_topics TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    source TEXT NOT NULL,
+    reviewed INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS archive_topics (
+    topic TEXT NOT NULL,
+    gao_number TEXT NOT NULL,
+    PRIMARY KEY (topic, gao_number)
+) WITHOUT ROWID;
+"""
+
+# External-content FTS index over titles, kept in step with archive by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS archive_fts USING fts5(
+    title, content='archive', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS archive_fts_insert AFTER INSERT ON archive BEGIN
+    INSERT INTO archive_fts (rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS archive_fts_delete AFTER DELETE ON archive BEGIN
+    INSERT INTO archive_fts (archive_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS archive_fts_update AFTER UPDATE OF title ON archive BEGIN
+    INSERT INTO archive_fts (archive_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO archive_fts (rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
+# Parsed (unreviewed) records never overwrite what is already archived
+INSERT_PARSED = """
+INSERT INTO archive (gao_number, title, date, original_topics, assigned_topics, notes,
+                     source, reviewed, updated_at)
+VALUES (?, ?, ?, ?, ?, '', ?, 0, ?)
+ON CONFLICT (gao_number) DO NOTHING
+"""
+
+UPSERT_REVIEWED = """
+INSERT INTO archive (gao_number, title, date, original_topics, assigned_topics, notes,
+                     source, reviewed, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)
+ON CONFLICT (gao_number) DO UPDATE SET
+    title = excluded.title,
+    date = excluded.date,
+    original_topics = excluded.original_topics,
+    assigned_topics = excluded.assigned_topics,
+    notes = excluded.notes,
+    source = excluded.source,
+    reviewed = 1,
+    updated_at = excluded.updated_at
+"""
+
+# Topic rows are always derived from the stored assignment (JSON1's json_each)
+INDEX_TOPICS = """
+INSERT OR IGNORE INTO archive_topics
+SELECT topic.value, a.gao_number FROM archive a, json_each(a.assigned_topics) topic
+WHERE a.gao_number = ?
+"""
+
+COLUMNS = ('gao_number', 'title', 'date', 'original_topics', 'assigned_topics', 'notes',
+           'source', 'reviewed', 'updated_at')
+SELECT = f"SELECT {', '.join('a.' + column for column in COLUMNS)} FROM archive a"
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is its of on or that the their "
+    "to was were with should could would more than need needs additional".split()
+)
+SIMILAR_TERMS = 12
+# SQLite's default limit on host parameters in one statement
+MAX_PARAMETERS = 999
+
+
+def _record(row):
+    record = dict(zip(COLUMNS, row))
+    record['original_topics'] = json.loads(record['original_topics'])
+    record['assigned_topics'] = json.loads(record['assigned_topics'])
+    record['reviewed'] = bool(record['reviewed'])
+    return record
+
+
+def title_terms(title):
+    """Distinct significant words of a title, in order."""
+    return list(dict.fromkeys(word for word in WORD_RE.findall(title.lower())
+                              if len(word) > 2 and word not in STOPWORDS))
+
+
+class PublicationArchive:
+    """Every publication ever loaded, with its latest reviewed topics.
+
+    Loading a document adds its publications as unreviewed records, without
+    touching ones already archived; saving a review upserts the publication as
+    reviewed. Writes go through a background BatchWriter; reads flush it first.
+    Lookups by GAO number and topic use indexes and titles an FTS5 index
+    (plain LIKE matching if this SQLite lacks FTS5).
+    """
+
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = connect(path)
+        try:
+            with conn:
+                conn.executescript(SCHEMA)
+            try:
+                with conn:
+                    conn.executescript(FTS_SCHEMA)
+                self.full_text = True
+            except sqlite3.OperationalError:
+                self.full_text = False
+        finally:
+            conn.close()
+        self._writer = BatchWriter(path, batch_size, name='mir-archive')
+
+    # -------------------------------------------------------------------------
+    # Writes (asynchronous)
+    # -------------------------------------------------------------------------
+    def add_parsed(self, publications, source):
+        """Archive freshly loaded publications that aren't archived yet."""
+        now = time.time()
+        rows = []
+        for pub in publications:
+            topics = json.dumps(pub['current_topics'])
+            rows.append((pub['gao_number'], pub['title'], pub['date'], topics, topics, source, now))
+        self._writer.put(INSERT_PARSED, rows)
+        self._writer.put(INDEX_TOPICS, [(row[0],) for row in rows])
+
+    def add_reviewed(self, publications, source):
+        """Archive reviewed publications, replacing earlier assignments."""
+        now = time.time()
+        rows = []
+        for pub in publications:
+            rows.append((pub['gao_number'], pub['title'], pub['date'],
+                         json.dumps(pub['current_topics']),
+                         json.dumps(pub.get('assigned_topics', pub['current_topics'])),
+                         pub.get('notes', ''), source, now))
+        keys = [(row[0],) for row in rows]
+        self._writer.put(UPSERT_REVIEWED, rows)
+        self._writer.put('DELETE FROM archive_topics WHERE gao_number = ?', keys)
+        self._writer.put(INDEX_TOPICS, keys)
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+    def _query(self, sql, parameters=()):
+        self.flush()
+        conn = connect(self.path)
+        try:
+            return conn.execute(sql, parameters).fetchall()
+        finally:
+            conn.close()
+
+    def get(self, gao_number):
+        """Archived record for one GAO number, or None."""
+        rows = self._query(f"{SELECT} WHERE a.gao_number = ?", (gao_number,))
+        return _record(rows[0]) if rows else None
+
+    def get_many(self, gao_numbers, reviewed_only=False):
+        """GAO number -> archived record for those of gao_numbers in the archive."""
+        gao_numbers = list(gao_numbers)
+        condition = " AND a.reviewed = 1" if reviewed_only else ""
+        records = {}
+        for start in range(0, len(gao_numbers), MAX_PARAMETERS):
+            chunk = gao_numbers[start:start + MAX_PARAMETERS]
+            placeholders = ', '.join('?' * len(chunk))
+            for row in self._query(f"{SELECT} WHERE a.gao_number IN ({placeholders}){condition}",
+                                   chunk):
+                record = _record(row)
+                records[record['gao_number']] = record
+        return records
+
+    def by_topic(self, topic, limit=100):
+        """Most recently updated records assigned topic."""
+        rows = self._query(
+            f"{SELECT} JOIN archive_topics t ON t.gao_number = a.gao_number "
+            "WHERE t.topic = ? ORDER BY a.updated_at DESC LIMIT ?", (topic, limit))
+        return [_record(row) for row in rows]
+
+    def search_titles(self, text, limit=20, exclude_source=None, reviewed_only=False):
+        """Records whose titles contain every word of text (prefix match), best first."""
+        terms = WORD_RE.findall(text.lower())
+        if not terms:
+            return []
+        if self.full_text:
+            return self._match(' AND '.join(f'"{term}"*' for term in terms),
+                               limit, exclude_source, reviewed_only)
+        return self._like(terms, limit, exclude_source, reviewed_only)
+
+    def similar(self, title, limit=5, exclude_source=None, reviewed_only=True):
+        """Reviewed records with titles sharing the most significant words with title."""
+        terms = title_terms(title)[:SIMILAR_TERMS]
+        if not terms:
+            return []
+        if self.full_text:
+            return self._match(' OR '.join(f'"{term}"' for term in terms),
+                               limit, exclude_source, reviewed_only)
+        return self._like(terms[:3], limit, exclude_source, reviewed_only)
+
+    def iter_reviewed(self):
+        """Every reviewed record, oldest first (e.g. to train suggestions)."""
+        return [_record(row) for row in
+                self._query(f"{SELECT} WHERE a.reviewed = 1 ORDER BY a.updated_at")]
+
+    def count(self, reviewed_only=False):
+        condition = " WHERE reviewed = 1" if reviewed_only else ""
+        return self._query(f"SELECT COUNT(*) FROM archive{condition}")[0][0]
+
+    def _filters(self, exclude_source, reviewed_only):
+        conditions, parameters = [], []
+        if exclude_source is not None:
+            conditions.append("a.source != ?")
+            parameters.append(exclude_source)
+        if reviewed_only:
+            conditions.append("a.reviewed = 1")
+        return ''.join(f" AND {condition}" for condition in conditions), parameters
+
+    def _match(self, query, limit, exclude_source, reviewed_only):
+        conditions, parameters = self._filters(exclude_source, reviewed_only)
+        rows = self._query(
+            f"{SELECT} JOIN archive_fts f ON f.rowid = a.id "
+            f"WHERE archive_fts MATCH ?{conditions} ORDER BY f.rank LIMIT ?",
+            [query, *parameters, limit])
+        return [_record(row) for row in rows]
+
+    def _like(self, terms, limit, exclude_source, reviewed_only):
+        conditions, parameters = self._filters(exclude_source, reviewed_only)
+        likes = ' AND '.join("a.title LIKE ?" for _ in terms)
+        rows = self._query(
+            f"{SELECT} WHERE {likes}{conditions} ORDER BY a.updated_at DESC LIMIT ?",
+            [*(f"%{term}%" for term in terms), *parameters, limit])
+        return [_record(row) for row in rows]
@@ -0,0 +1,42 @@
+"""
+Browser autosave payloads: compact deltas of review state per publication
+"""
+import base64
+import json
+import zlib
+
+from mir.export import assigned_topics
+
+
+def encode_delta(publications, indices, current_index):
+    """Compressed (zlib + base64) review state for the given publication indices.
+
+    Only reviewer-editable fields are sent; everything else comes from the
+    document itself. The browser merges these records into its stored copy.
+    """
+    records = {}
+    for index in sorted(indices):
+        pub = publications[index]
+        records[pub['gao_number']] = {'t': assigned_topics(pub), 'n': pub.get('notes', '')}
+    raw = json.dumps({'i': current_index, 'r': records}, separators=(',', ':'))
+    return base64.b64encode(zlib.compress(raw.encode('utf-8'), 6)).decode('ascii')
+
+
+def apply_saved_state(publications, state):
+    """Rehydrate publications from a state saved in the browser.
+
+    Returns (number of publications restored, saved current index).
+    """
+    records = state.get('r') or {}
+    restored = 0
+    for pub in publications:
+        record = records.get(pub['gao_number'])
+        if record is None:
+            continue
+        pub['assigned_topics'] = list(record.get('t', pub['current_topics']))
+        pub['notes'] = record.get('n', '')
+        restored += 1
+    current_index = state.get('i', 0)
+    if not isinstance(current_index, int):
+        current_index = 0
+    return restored, max(0, min(current_index, len(publications) - 1))
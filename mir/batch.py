@@ -0,0 +1,48 @@
+"""
+Load several Month in Review documents at once into one merged review queue
+"""
+import io
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+from mir.convert import iter_docx_lines
+from mir.parser import iter_publications, merge_documents
+
+
+def document_lines(name, data, cache=None, service=None, engine=None):
+    """Markdown lines for one uploaded .docx or .md file."""
+    if name.lower().endswith('.docx'):
+        if service is None:
+            return iter_docx_lines(data, cache=cache, engine=engine)
+        markdown_content = service.cached(data)
+        if markdown_content is None:
+            markdown_content = service.submit(data).result()
+        return markdown_content.split('\n')
+    return io.StringIO(data.decode('utf-8'))
+
+
+def parse_document(name, data, cache=None, service=None, engine=None):
+    """Convert and parse one document into its own publication list."""
+    return list(iter_publications(document_lines(name, data, cache, service, engine)))
+
+
+def load_documents(documents, cache=None, service=None, max_workers=None):
+    """Convert and parse (name, bytes) documents concurrently, then merge them.
+
+    Each document is converted and parsed on its own thread (conversions run
+    in pandoc subprocesses or the service's worker processes, so they overlap),
+    into its own GAO-number index. The per-document lists are then folded into
+    one shared index in upload order, so the merge is deterministic no matter
+    which document finished first. Returns publications sorted by GAO number.
+    """
+    documents = list(documents)
+    if not documents:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers or len(documents)) as executor:
+        parsed = list(executor.map(
+            lambda document: parse_document(document[0], document[1], cache, service),
+            documents,
+        ))
+    publications = merge_documents(zip((name for name, _ in documents), parsed))
+    publications.sort(key=itemgetter('gao_number'))
+    return publications
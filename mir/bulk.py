@@ -0,0 +1,93 @@
+"""
+Bulk topic edits (add, remove, replace) over a filtered selection of publications
+"""
+import re
+
+from mir.topics import TOPIC_BITS
+
+ADD = "Add"
+REMOVE = "Remove"
+REPLACE = "Replace"
+OPERATIONS = (ADD, REMOVE, REPLACE)
+
+_NUMBER_RE = re.compile(r'\d+')
+
+
+def gao_sort_key(gao_number):
+    """Numeric parts of a GAO number, so GAO-24-99 sorts before GAO-24-100."""
+    return tuple(int(part) for part in _NUMBER_RE.findall(gao_number))
+
+
+def select_rows(table, title_pattern='', gao_from='', gao_to='', topic=None):
+    """Indices of publications matching every given filter.
+
+    title_pattern is a case-insensitive regular expression searched in the
+    title (re.error if invalid); gao_from/gao_to bound the GAO number
+    inclusively, compared numerically; topic must be among the assigned topics.
+    """
+    rows = range(len(table))
+    if topic:
+        bit = TOPIC_BITS[topic]
+        masks = table.assigned_masks
+        rows = [index for index in rows if masks[index] & bit]
+    if gao_from or gao_to:
+        low = gao_sort_key(gao_from) if gao_from else None
+        high = gao_sort_key(gao_to) if gao_to else None
+        numbers = table.gao_numbers
+        selected = []
+        for index in rows:
+            key = gao_sort_key(numbers[index])
+            if (low is None or key >= low) and (high is None or key <= high):
+                selected.append(index)
+        rows = selected
+    if title_pattern:
+        search = re.compile(title_pattern, re.IGNORECASE).search
+        titles = table.titles
+        rows = [index for index in rows if search(titles[index])]
+    return list(rows)
+
+
+def bulk_edit(table, rows, operation, topic, replacement=None):
+    """Apply one operation to the assigned topics of rows, in place.
+
+    ADD sets topic, REMOVE clears it, REPLACE swaps topic for replacement
+    where topic is present. Returns [(index, mask before, mask after)] for the
+    rows that actually changed (mir.history.Change fields), enough to undo it.
+    """
+    bit = TOPIC_BITS[topic]
+    masks = table.assigned_masks
+    changes = []
+    if operation == ADD:
+        for index in rows:
+            before = masks[index]
+            if not before & bit:
+                masks[index] = before | bit
+                changes.append((index, before, before | bit))
+    elif operation == REMOVE:
+        for index in rows:
+            before = masks[index]
+            if before & bit:
+                masks[index] = before & ~bit
+                changes.append((index, before, before & ~bit))
+    elif operation == REPLACE:
+        swap = bit | TOPIC_BITS[replacement]
+        for index in rows:
+            before = masks[index]
+            if before & bit and replacement != topic:
+                after = (before | swap) ^ bit
+                masks[index] = after
+                changes.append((index, before, after))
+    else:
+        raise ValueError(f"Unknown bulk operation: {operation}")
+    return changes
+
+
+def edited_rows(changes, saved=None):
+    """Rows touched by bulk_edit() changes, plus saved's row, each once.
+
+    saved is the Change of a publication saved into the same step (the one
+    on screen), so its edits are logged even when the bulk edit missed it.
+    """
+    rows = [] if saved is None else [saved[0]]
+    rows.extend(change[0] for change in changes if saved is None or change[0] != saved[0])
+    return rows
@@ -0,0 +1,162 @@
+"""
+Content-addressed cache for converted documents (memory + local disk, LRU)
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def make_key(data, *parts):
+    """Build a cache key from document bytes plus anything that affects the output."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """Size-bounded LRU cache of markdown text, held in memory and on disk.
+
+    Memory entries are evicted least-recently-used first once their total size
+    exceeds max_memory_bytes. Disk entries use file mtime as the recency stamp
+    so the order survives restarts and is shared between processes.
+    """
+
+    def __init__(self, directory, max_memory_bytes, max_disk_bytes):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+    def get(self, key):
+        """Return cached markdown for key, or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key][0]
+
+        text = self._disk_get(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._memory_put(key, text)
+        return text
+
+    def put(self, key, text):
+        """Store markdown for key in both cache levels."""
+        with self._lock:
+            self._memory_put(key, text)
+        self._disk_put(key, text)
+
+    def clear(self):
+        """Drop every entry from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        for path, _, _ in self._disk_entries():
+            _remove_quietly(path)
+
+    # -------------------------------------------------------------------------
+    # Memory level
+    # -------------------------------------------------------------------------
+    def _memory_put(self, key, text):
+        size = len(text.encode('utf-8'))
+        if size > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._memory[key][1]
+        self._memory[key] = (text, size)
+        self._memory.move_to_end(key)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    # -------------------------------------------------------------------------
+    # Disk level
+    # -------------------------------------------------------------------------
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.md")
+
+    def _disk_get(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except (FileNotFoundError, OSError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return text
+
+    def _disk_put(self, key, text):
+        if not self.directory:
+            return
+        data = text.encode('utf-8')
+        if len(data) > self.max_disk_bytes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            _remove_quietly(tmp_path)
+            return
+        self._disk_evict()
+
+    def _disk_entries(self):
+        if not self.directory:
+            return []
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith('.md'):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.path, stat.st_mtime, stat.st_size))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _disk_evict(self):
+        entries = self._disk_entries()
+        total = sum(size for _, _, size in entries)
+        if total <= self.max_disk_bytes:
+            return
+        for path, _, size in sorted(entries, key=lambda e: e[1]):
+            _remove_quietly(path)
+            total -= size
+            if total <= self.max_disk_bytes:
+                break
+
+
+def _remove_quietly(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -0,0 +1,230 @@
+"""
+Command-line batch processing: convert, parse, apply assignments and export without Streamlit
+
+    python -m mir archive/2023/ archive/2024/*.docx -o out/ --assignments reviewed.csv --jobs 8
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+from mir import settings
+from mir.batch import parse_document
+from mir.cache import ConversionCache
+from mir.docx_export import create_docx_output
+from mir.export import CsvExport, create_markdown_output, read_csv_records
+from mir.parser import merge_documents
+from mir.table import PublicationTable
+from mir.topics import ALL_TOPICS
+
+INPUT_EXTENSIONS = ('.docx', '.md')
+FORMATS = ('csv', 'markdown', 'docx')
+OUTPUT_SUFFIXES = {'csv': '.csv', 'markdown': '.md', 'docx': '.docx'}
+
+
+def find_inputs(paths):
+    """(path, name) of input files, expanding directories recursively, in sorted order per directory.
+
+    name is the path relative to the directory argument it was found under
+    (2024/jan.docx for archive/2024/jan.docx given archive/), or the file name.
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend((os.path.join(root, name), os.path.relpath(os.path.join(root, name), path))
+                             for name in sorted(files)
+                             if name.lower().endswith(INPUT_EXTENSIONS) and not name.startswith('~$'))
+        else:
+            found.append((path, os.path.basename(path)))
+    return found
+
+
+def output_stem(name):
+    """Export path (without extension) for an input, keeping its subdirectories."""
+    return os.path.splitext(name)[0] + '_reviewed'
+
+
+def stem_collisions(inputs):
+    """Groups of input paths that would be written to the same exports."""
+    by_stem = {}
+    for path, name in inputs:
+        by_stem.setdefault(os.path.normcase(output_stem(name)), []).append(path)
+    return [paths for paths in by_stem.values() if len(paths) > 1]
+
+
+def read_assignments(path):
+    """GAO number -> reviewed record from an exported progress/results CSV."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return {record['gao_number']: record for record in read_csv_records(f)}
+
+
+def apply_assignments(table, assignments):
+    """Copy assigned topics and notes onto matching publications; returns the match count."""
+    matched = 0
+    for index, gao_number in enumerate(table.gao_numbers):
+        record = assignments.get(gao_number)
+        if record is None:
+            continue
+        table.set_assigned_topics(index, record['assigned_topics'])
+        table.notes[index] = record['notes']
+        matched += 1
+    return matched
+
+
+def write_outputs(table, stem, output_dir, formats):
+    """Write the requested exports as output_dir/stem.<ext>; returns the paths written."""
+    os.makedirs(os.path.dirname(os.path.join(output_dir, stem)) or '.', exist_ok=True)
+    written = []
+    for fmt in formats:
+        path = os.path.join(output_dir, stem + OUTPUT_SUFFIXES[fmt])
+        if fmt == 'csv':
+            data = CsvExport(table).to_bytes()
+        elif fmt == 'markdown':
+            data = create_markdown_output(table, ALL_TOPICS).encode('utf-8')
+        else:
+            data = create_docx_output(table, ALL_TOPICS)
+        with open(path, 'wb') as f:
+            f.write(data)
+        written.append(path)
+    return written
+
+
+# =============================================================================
+# PER-FILE WORK (runs in worker processes with --jobs)
+# =============================================================================
+_options = None
+_assignments = None
+_cache = None
+
+
+def _init(options, assignments):
+    global _options, _assignments, _cache
+    _options = options
+    _assignments = assignments
+    _cache = None
+    if options['cache']:
+        # Disk only, shared with the Streamlit app and other workers
+        _cache = ConversionCache(settings.CACHE_DIR, max_memory_bytes=0,
+                                 max_disk_bytes=settings.CACHE_DISK_MB * 1024 * 1024)
+
+
+def _parse_file(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return parse_document(path, data, cache=_cache, engine=_options['engine'])
+
+
+def _process_file(item):
+    """Parse one (path, name) input and write its exports. Returns (path, publications, matched, error)."""
+    path, name = item
+    try:
+        table = PublicationTable.from_records(sorted(_parse_file(path), key=itemgetter('gao_number')))
+        matched = apply_assignments(table, _assignments)
+        write_outputs(table, output_stem(name), _options['output_dir'], _options['formats'])
+        return path, len(table), matched, None
+    except Exception as e:  # reported per file so one bad document doesn't stop the run
+        return path, 0, 0, f"{type(e).__name__}: {e}"
+
+
+def _parse_file_safe(item):
+    path, _ = item
+    try:
+        return path, _parse_file(path), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def _run(function, inputs, jobs, options, assignments):
+    """Map function over (path, name) inputs, in input order, on jobs processes (or in this one)."""
+    if jobs <= 1 or len(inputs) <= 1:
+        _init(options, assignments)
+        yield from map(function, inputs)
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init,
+                             initargs=(options, assignments)) as executor:
+        # chunksize amortizes pickling when there are many small files
+        yield from executor.map(function, inputs, chunksize=max(1, len(inputs) // (jobs * 4)))
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m mir',
+        description="Convert and parse GAO Month in Review documents and export the results.",
+    )
+    parser.add_argument('inputs', nargs='+', help=".docx/.md files or directories to search")
+    parser.add_argument('-o', '--output-dir', default='.', help="where to write exports (default: .)")
+    parser.add_argument('-a', '--assignments', help="CSV of reviewed topics/notes to apply (app export format)")
+    parser.add_argument('-f', '--format', dest='formats', action='append', choices=FORMATS,
+                        help="export format, repeatable (default: csv and markdown)")
+    parser.add_argument('-m', '--merge', metavar='NAME',
+                        help="merge all inputs into one review queue written as NAME.<ext>")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes (default: 1; 0 = one per CPU)")
+    parser.add_argument('--engine', choices=('native', 'pandoc'), default=settings.CONVERSION_ENGINE,
+                        help=".docx conversion engine (default: %(default)s)")
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help="don't read or write the conversion cache")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    inputs = find_inputs(args.inputs)
+    if not inputs:
+        print("No .docx or .md files found.", file=sys.stderr)
+        return 1
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    assignments = read_assignments(args.assignments) if args.assignments else {}
+    options = {
+        'output_dir': args.output_dir,
+        'formats': args.formats or ['csv', 'markdown'],
+        'engine': args.engine,
+        'cache': args.cache,
+    }
+
+    failures = 0
+    if args.merge:
+        documents = []
+        names = dict(inputs)
+        for path, publications, error in _run(_parse_file_safe, inputs, jobs, options, assignments):
+            if error:
+                failures += 1
+                print(f"{path}: {error}", file=sys.stderr)
+            else:
+                documents.append((names[path], publications))
+                print(f"{path}: {len(publications)} publications")
+        records = merge_documents(documents)
+        records.sort(key=itemgetter('gao_number'))
+        table = PublicationTable.from_records(records)
+        matched = apply_assignments(table, assignments)
+        for path in write_outputs(table, args.merge, options['output_dir'], options['formats']):
+            print(f"Wrote {path}")
+        print(f"{len(table)} publications merged from {len(documents)} documents; "
+              f"{matched} with assignments")
+    else:
+        collisions = stem_collisions(inputs)
+        if collisions:
+            for paths in collisions:
+                print(f"Would write the same exports: {', '.join(paths)}", file=sys.stderr)
+            print("Pass their common parent directory, or use --merge.", file=sys.stderr)
+            return 1
+        total = 0
+        for path, count, matched, error in _run(_process_file, inputs, jobs, options, assignments):
+            if error:
+                failures += 1
+                print(f"{path}: {error}", file=sys.stderr)
+            else:
+                total += count
+                print(f"{path}: {count} publications, {matched} with assignments")
+        print(f"{total} publications from {len(inputs) - failures} documents")
+
+    if failures:
+        print(f"{failures} documents failed", file=sys.stderr)
+        return 1
+    return 0
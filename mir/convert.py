@@ -0,0 +1,188 @@
+"""
+Document conversion for Month in Review uploads
+"""
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from mir import native_docx, settings
+from mir.cache import make_key
+
+# Input/output formats are explicit so the same flags work for stdin/stdout
+PANDOC_FLAGS = ('-f', 'docx', '-t', 'markdown', '--track-changes=all')
+
+
+def pandoc_fingerprint():
+    """Identify the installed pandoc without running it.
+
+    Uses the resolved binary path, size and mtime, which change whenever pandoc
+    is upgraded, so cache lookups never need to spawn `pandoc --version`.
+    """
+    path = shutil.which('pandoc')
+    if path is None:
+        raise FileNotFoundError('pandoc')
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    return f"{path}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def pandoc_cache_key(data):
+    """Cache key for a pandoc conversion of data with the current binary and flags."""
+    return make_key(data, 'pandoc', pandoc_fingerprint(), *PANDOC_FLAGS)
+
+
+def native_cache_key(data):
+    """Cache key for a native-engine conversion of data."""
+    return make_key(data, 'native', native_docx.ENGINE_VERSION)
+
+
+def cached_docx_markdown(data, cache, engine=None):
+    """Return markdown for data if a conversion is already cached, else None.
+
+    Never converts anything; used to skip queueing work that is already done.
+    """
+    engine = engine or settings.CONVERSION_ENGINE
+    if engine == 'native':
+        markdown_content = cache.get(native_cache_key(data))
+        if markdown_content is not None:
+            return markdown_content
+    try:
+        return cache.get(pandoc_cache_key(data))
+    except FileNotFoundError:
+        return None
+
+
+def convert_docx_with_pandoc(data):
+    """Convert .docx bytes to markdown by running pandoc on temp files."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_docx:
+        tmp_docx.write(data)
+        tmp_docx_path = tmp_docx.name
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.md') as tmp_md:
+        tmp_md_path = tmp_md.name
+
+    try:
+        subprocess.run([
+            'pandoc',
+            *PANDOC_FLAGS,
+            tmp_docx_path,
+            '-o', tmp_md_path
+        ], check=True, capture_output=True)
+
+        with open(tmp_md_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    finally:
+        os.unlink(tmp_docx_path)
+        os.unlink(tmp_md_path)
+
+
+def iter_pandoc_pipe_lines(data):
+    """Yield markdown lines from pandoc, feeding .docx bytes through stdin.
+
+    Nothing touches the disk. The upload is written from a helper thread so a
+    large document cannot deadlock against pandoc's output; stderr is drained
+    the same way. A non-zero exit raises CalledProcessError once stdout ends.
+    """
+    cmd = ['pandoc', *PANDOC_FLAGS]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE)
+    stderr_chunks = []
+
+    def feed_stdin():
+        try:
+            proc.stdin.write(data)
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    def drain_stderr():
+        stderr_chunks.append(proc.stderr.read())
+
+    threads = [threading.Thread(target=feed_stdin, daemon=True),
+               threading.Thread(target=drain_stderr, daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        yield from io.TextIOWrapper(proc.stdout, encoding='utf-8')
+        returncode = proc.wait()
+        for thread in threads:
+            thread.join()
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, cmd, stderr=b''.join(stderr_chunks))
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+def iter_docx_lines(data, cache=None, mode=None, engine=None):
+    """Yield markdown lines (with line endings) for .docx bytes.
+
+    engine is 'native' (in-process OOXML reader, falling back to pandoc for
+    files it cannot open) or 'pandoc'; it defaults to MIR_CONVERSION_ENGINE.
+    A cache hit never runs either engine. On a miss pandoc's lines are streamed
+    as they are produced and the complete text is cached once conversion
+    succeeds. The native engine's output is collected first: a body that turns
+    out to be corrupt part way through still falls back to pandoc instead of
+    failing after lines were handed out. Errors from pandoc propagate
+    unchanged (CalledProcessError, FileNotFoundError) so the caller can report them.
+    """
+    engine = engine or settings.CONVERSION_ENGINE
+    if engine == 'native':
+        key = native_cache_key(data)
+        markdown_content = cache.get(key) if cache is not None else None
+        if markdown_content is None:
+            try:
+                markdown_content = ''.join(native_docx.iter_markdown_lines(data))
+            except native_docx.NativeDocxError:
+                markdown_content = None
+            if markdown_content is not None and cache is not None:
+                cache.put(key, markdown_content)
+        if markdown_content is not None:
+            yield from io.StringIO(markdown_content)
+            return
+
+    yield from _iter_pandoc_lines(data, cache, mode or settings.PANDOC_MODE)
+
+
+def _iter_pandoc_lines(data, cache, mode):
+    key = None
+    if cache is not None:
+        key = pandoc_cache_key(data)
+        markdown_content = cache.get(key)
+        if markdown_content is not None:
+            yield from io.StringIO(markdown_content)
+            return
+
+    if mode == 'tempfile':
+        markdown_content = convert_docx_with_pandoc(data)
+        if cache is not None:
+            cache.put(key, markdown_content)
+        yield from io.StringIO(markdown_content)
+    else:
+        yield from _stream_into_cache(iter_pandoc_pipe_lines(data), cache, key)
+
+
+def _stream_into_cache(lines, cache, key):
+    """Pass lines through, caching the full text once the source is exhausted."""
+    if cache is None:
+        yield from lines
+        return
+    collected = []
+    for line in lines:
+        collected.append(line)
+        yield line
+    cache.put(key, ''.join(collected))
+
+
+def convert_docx(data, cache=None, mode=None, engine=None):
+    """Convert .docx bytes to markdown, returning a cached result when available."""
+    return ''.join(iter_docx_lines(data, cache=cache, mode=mode, engine=engine))
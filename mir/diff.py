@@ -0,0 +1,75 @@
+"""
+Topic change diff between original and assigned topics, for a whole table at once
+"""
+from mir.topics import ALL_TOPICS, TOPIC_BITS, iter_bits
+
+BIT_TOPICS = {bit: topic for topic, bit in TOPIC_BITS.items()}
+
+ADDED = "Added"
+REMOVED = "Removed"
+
+
+def change_masks(table):
+    """(index, added_mask, removed_mask) for every publication whose official topics changed."""
+    return [
+        (index, assigned & ~original, original & ~assigned)
+        for index, (original, assigned) in enumerate(zip(table.original_masks, table.assigned_masks))
+        if original != assigned
+    ]
+
+
+def _extra_changes(table):
+    """Changes to topics outside ALL_TOPICS, from the sparse extras dicts."""
+    changes = []
+    for index in table.extra_topic_rows():
+        original = table.extra_topics(index, assigned=False)
+        assigned = table.extra_topics(index)
+        for topic in assigned:
+            if topic not in original:
+                changes.append((index, ADDED, topic))
+        for topic in original:
+            if topic not in assigned:
+                changes.append((index, REMOVED, topic))
+    return changes
+
+
+def change_rows(table):
+    """One row per added or removed topic, ordered by publication then change."""
+    changes = []
+    for index, added, removed in change_masks(table):
+        changes.extend((index, ADDED, BIT_TOPICS[bit]) for bit in iter_bits(added))
+        changes.extend((index, REMOVED, BIT_TOPICS[bit]) for bit in iter_bits(removed))
+    changes.extend(_extra_changes(table))
+    changes.sort(key=lambda change: change[0])
+
+    gao_numbers, titles = table.gao_numbers, table.titles
+    return [
+        {'gao_number': gao_numbers[index], 'change': change, 'topic': topic, 'title': titles[index]}
+        for index, change, topic in changes
+    ]
+
+
+def topic_summary(table):
+    """Per-topic counts before and after review, with the publications added and removed."""
+    added_counts = dict.fromkeys(TOPIC_BITS.values(), 0)
+    removed_counts = dict.fromkeys(TOPIC_BITS.values(), 0)
+    for _, added, removed in change_masks(table):
+        for bit in iter_bits(added):
+            added_counts[bit] += 1
+        for bit in iter_bits(removed):
+            removed_counts[bit] += 1
+
+    before = table.topic_counts(assigned=False)
+    summary = []
+    for topic in ALL_TOPICS:
+        bit = TOPIC_BITS[topic]
+        if not (before[topic] or added_counts[bit]):
+            continue
+        summary.append({
+            'topic': topic,
+            'before': before[topic],
+            'added': added_counts[bit],
+            'removed': removed_counts[bit],
+            'after': before[topic] + added_counts[bit] - removed_counts[bit],
+        })
+    return summary
@@ -0,0 +1,105 @@
+"""
+Reviewed Month in Review written directly as a .docx (OOXML zip), same layout as the Markdown export
+"""
+import io
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+from mir.export import TopicIndex
+from mir.topics import ALL_TOPICS
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+<Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
+</Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="character" w:styleId="Hyperlink"><w:name w:val="Hyperlink"/><w:rPr><w:color w:val="0563C1"/><w:u w:val="single"/></w:rPr></w:style>
+</w:styles>"""
+
+NUMBERING = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:numbering xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:abstractNum w:abstractNumId="0"><w:lvl w:ilvl="0"><w:numFmt w:val="bullet"/><w:lvlText w:val="&#8226;"/><w:pPr><w:ind w:left="720" w:hanging="360"/></w:pPr></w:lvl></w:abstractNum>
+<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>
+</w:numbering>"""
+
+DOCUMENT_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><w:body>'
+)
+DOCUMENT_END = '<w:sectPr/></w:body></w:document>'
+
+RELS_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rIdStyles" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '<Relationship Id="rIdNumbering" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>'
+)
+HYPERLINK_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink'
+
+BREAK = '<w:r><w:br/></w:r>'
+
+
+def _run(text, bold=False):
+    props = '<w:rPr><w:b/></w:rPr>' if bold else ''
+    return f'<w:r>{props}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
+def create_docx_output(publications, all_topics=ALL_TOPICS, topic_index=None):
+    """Build the reorganized Month in Review as .docx bytes."""
+    if topic_index is None or topic_index.publications is not publications:
+        topic_index = TopicIndex(publications)
+
+    body = [
+        f'<w:p>{_run("GAO Month in Review", bold=True)}</w:p>',
+        f'<w:p>{_run("Month YYYY")}</w:p>',
+    ]
+    links = []
+    for topic in all_topics:
+        rows = topic_index.rows(topic)
+        if not rows:
+            continue
+        body.append(f'<w:p>{_run(topic.upper(), bold=True)}{BREAK}</w:p>')
+        for row in rows:
+            gao_number = publications.gao_numbers[row]
+            url = f"https://www.gao.gov/products/{gao_number}"
+            links.append(url)
+            body.append(
+                f'<w:p>{_run(publications.titles[row], bold=True)}{BREAK}'
+                f'{_run(f"{gao_number}, {publications.dates[row]}")}</w:p>'
+                '<w:p><w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr></w:pPr>'
+                f'{_run("Report: ")}<w:hyperlink r:id="rIdLink{len(links)}">'
+                f'<w:r><w:rPr><w:rStyle w:val="Hyperlink"/></w:rPr>'
+                f'<w:t xml:space="preserve">{escape(url)}</w:t></w:r></w:hyperlink></w:p>'
+            )
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', PACKAGE_RELS)
+        archive.writestr('word/styles.xml', STYLES)
+        archive.writestr('word/numbering.xml', NUMBERING)
+        with archive.open('word/_rels/document.xml.rels', 'w') as rels:
+            rels.write(RELS_START.encode('utf-8'))
+            for number, url in enumerate(links, 1):
+                rels.write(f'<Relationship Id="rIdLink{number}" Type="{HYPERLINK_TYPE}" '
+                           f'Target={quoteattr(url)} TargetMode="External"/>'.encode('utf-8'))
+            rels.write(b'</Relationships>')
+        with archive.open('word/document.xml', 'w') as document:
+            document.write(DOCUMENT_START.encode('utf-8'))
+            for chunk in body:
+                document.write(chunk.encode('utf-8'))
+            document.write(DOCUMENT_END.encode('utf-8'))
+    return buffer.getvalue()
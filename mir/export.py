@@ -0,0 +1,179 @@
+"""
+Export formats for reviewed publications
+"""
+import bisect
+import csv
+import io
+from array import array
+
+from mir.topics import ALL_TOPICS, TOPIC_BITS, iter_bits
+
+CSV_COLUMNS = ['gao_number', 'title', 'date', 'original_topics', 'assigned_topics', 'notes']
+
+
+def assigned_topics(pub):
+    """Topics assigned in review, defaulting to the document's original topics."""
+    return pub.get('assigned_topics', pub['current_topics'])
+
+
+def csv_record(pub):
+    """One publication as a CSV record (list of column values)."""
+    return [
+        pub['gao_number'],
+        pub['title'],
+        pub['date'],
+        ' | '.join(pub['current_topics']),
+        ' | '.join(assigned_topics(pub)),
+        pub.get('notes', ''),
+    ]
+
+
+def _format_csv_line(values):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow(values)
+    return buffer.getvalue()
+
+
+CSV_HEADER = _format_csv_line(CSV_COLUMNS)
+
+
+def _split_topics(value):
+    return [topic.strip() for topic in (value or '').split(' | ') if topic.strip()]
+
+
+def read_csv_records(fileobj):
+    """Publication dicts from a CSV written by CsvExport (the reverse of csv_record)."""
+    records = []
+    for row in csv.DictReader(fileobj):
+        if not row.get('gao_number'):
+            continue
+        current_topics = _split_topics(row.get('original_topics'))
+        records.append({
+            'gao_number': row['gao_number'].strip(),
+            'title': row.get('title') or '',
+            'date': row.get('date') or '',
+            'current_topics': current_topics,
+            'assigned_topics': (_split_topics(row['assigned_topics'])
+                                if 'assigned_topics' in row else current_topics),
+            'notes': row.get('notes') or '',
+        })
+    return records
+
+
+class CsvExport:
+    """Incrementally maintained CSV serialization of a publication list.
+
+    Each row is serialized once and kept until mark_changed() is called for its
+    publication; every change bumps version. to_bytes() only re-serializes the
+    changed rows and reuses the previous bytes when nothing changed, so reruns
+    that don't save anything cost nothing. Output matches DataFrame.to_csv(index=False).
+    """
+
+    def __init__(self, publications):
+        self.publications = publications
+        self.version = 0
+        self._rows = [None] * len(publications)
+        self._dirty = set(range(len(publications)))
+        self._bytes = None
+        self._bytes_version = -1
+
+    def mark_changed(self, index):
+        """Invalidate the cached row for publications[index]."""
+        self._dirty.add(index)
+        self.version += 1
+
+    def mark_all_changed(self):
+        self._dirty.update(range(len(self.publications)))
+        self.version += 1
+
+    def to_bytes(self):
+        """UTF-8 CSV for the current state, rebuilt only if something changed."""
+        if self._bytes is None or self._bytes_version != self.version:
+            for index in self._dirty:
+                self._rows[index] = _format_csv_line(csv_record(self.publications[index]))
+            self._dirty.clear()
+            self._bytes = (CSV_HEADER + ''.join(self._rows)).encode('utf-8')
+            self._bytes_version = self.version
+        return self._bytes
+
+
+# =============================================================================
+# MARKDOWN
+# =============================================================================
+class TopicIndex:
+    """Topic -> publications sorted by title, maintained as assignments change.
+
+    Each official topic keeps a sorted list of (title, row) keys; saving a
+    publication moves only that row between the buckets whose bits changed,
+    using bisect. Ties on title keep table order, matching a stable sort.
+    The rendered markdown is cached until the next change.
+    """
+
+    def __init__(self, publications):
+        self.publications = publications
+        self.version = 0
+        self._masks = array(publications.assigned_masks.typecode, publications.assigned_masks)
+        self._buckets = {bit: [] for bit in TOPIC_BITS.values()}
+        titles = publications.titles
+        for row, mask in enumerate(self._masks):
+            for bit in iter_bits(mask):
+                self._buckets[bit].append((titles[row], row))
+        for bucket in self._buckets.values():
+            bucket.sort()
+        self._markdown = None
+        self._markdown_version = -1
+
+    def mark_changed(self, row):
+        """Re-file publications[row] under its current assigned topics."""
+        old = self._masks[row]
+        new = self.publications.assigned_masks[row]
+        if old == new:
+            return
+        key = (self.publications.titles[row], row)
+        for bit in iter_bits(old & ~new):
+            bucket = self._buckets[bit]
+            del bucket[bisect.bisect_left(bucket, key)]
+        for bit in iter_bits(new & ~old):
+            bisect.insort(self._buckets[bit], key)
+        self._masks[row] = new
+        self.version += 1
+
+    def mark_all_changed(self):
+        for row in range(len(self._masks)):
+            self.mark_changed(row)
+
+    def rows(self, topic):
+        """Rows filed under topic, in title order."""
+        bit = TOPIC_BITS.get(topic)
+        return [row for _, row in self._buckets[bit]] if bit else []
+
+    def markdown(self, all_topics=ALL_TOPICS):
+        """Markdown document for the current assignments (cached per version)."""
+        if self._markdown is None or self._markdown_version != self.version:
+            self._markdown = self._render(all_topics)
+            self._markdown_version = self.version
+        return self._markdown
+
+    def _render(self, all_topics):
+        pubs = self.publications
+        out = io.StringIO()
+        out.write("**GAO Month in Review**\n\nMonth YYYY\\\n\\\n")
+        for topic in all_topics:
+            bit = TOPIC_BITS.get(topic)
+            bucket = self._buckets.get(bit)
+            if not bucket:
+                continue
+            out.write(f"\n**{topic.upper()}**\\\n\\")
+            for _, row in bucket:
+                gao_number = pubs.gao_numbers[row]
+                url = f"https://www.gao.gov/products/{gao_number}"
+                out.write(f"\n**{pubs.titles[row]}**\\\n{gao_number}, {pubs.dates[row]}\n"
+                          f"\n-   Report: [{url}]({url})\n")
+        return out.getvalue()
+
+
+def create_markdown_output(publications, all_topics, topic_index=None):
+    """Create markdown document from reviewed publications."""
+    if topic_index is None or topic_index.publications is not publications:
+        topic_index = TopicIndex(publications)
+    return topic_index.markdown(all_topics)
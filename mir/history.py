@@ -0,0 +1,192 @@
+"""
+Undo/redo of topic and notes edits, kept as compact per-publication deltas
+"""
+import collections
+import json
+import time
+
+from mir.topics import mask_to_topics
+
+# One publication's edit: assigned-topic masks before and after, plus a
+# notes_delta() and the (before, after) PublicationTable.listed_topics() when
+# those changed, i.e. when topics outside ALL_TOPICS or their order changed
+Change = collections.namedtuple('Change', 'index mask_before mask_after notes topics',
+                                defaults=(None, None))
+Step = collections.namedtuple('Step', 'label changes')
+
+
+def notes_delta(before, after):
+    """(start, removed, inserted) turning before into after, or None if equal.
+
+    Only the span between the common prefix and suffix is kept, so an edit to
+    long notes costs what was typed, not two copies of the notes.
+    """
+    if before == after:
+        return None
+    start = 0
+    limit = min(len(before), len(after))
+    while start < limit and before[start] == after[start]:
+        start += 1
+    end = 0
+    while end < limit - start and before[-1 - end] == after[-1 - end]:
+        end += 1
+    return start, before[start:len(before) - end], after[start:len(after) - end]
+
+
+def apply_notes_delta(text, delta, forward=True):
+    start, removed, inserted = delta
+    if not forward:
+        removed, inserted = inserted, removed
+    return text[:start] + inserted + text[start + len(removed):]
+
+
+def snapshot(table, index):
+    """What an edit of one publication can change: (mask, listed topics, notes)."""
+    return table.assigned_masks[index], table.listed_topics(index), table.notes[index]
+
+
+def make_change(index, before, after):
+    """Change between two snapshot()s of a publication, or None if nothing changed."""
+    if before == after:
+        return None
+    (mask_before, topics_before, notes_before), (mask_after, topics_after, notes_after) = before, after
+    return Change(index, mask_before, mask_after, notes_delta(notes_before, notes_after),
+                  (topics_before, topics_after) if topics_before != topics_after else None)
+
+
+class EditHistory:
+    """Bounded undo and redo stacks of edit steps.
+
+    A step is one user action (a save, a bulk edit) holding a Change per
+    publication it touched. Recording a step clears the redo stack. The
+    oldest steps are dropped once more than max_steps are held, or their
+    changes add up to more than max_changes, so memory stays bounded however
+    long the session runs. The newest step is always kept, however large, so
+    the last action can be undone.
+
+    Every edit, undo and redo is also appended to an operation log for
+    to_jsonl(). Log entries share their steps with the stacks; the log keeps
+    at most max_log entries and max_changes changes, counting what it drops.
+    """
+
+    def __init__(self, max_steps=100, max_changes=50000, max_log=1000):
+        self.max_steps = max_steps
+        self.max_changes = max_changes
+        self.max_log = max_log
+        self._undo = collections.deque()
+        self._redo = []
+        self._change_count = 0
+        self._log = collections.deque()
+        self._log_change_count = 0
+        self.log_dropped = 0
+
+    def record(self, label, changes):
+        changes = tuple(Change(*change) for change in changes)
+        if not changes:
+            return
+        self._undo.append(Step(label, changes))
+        self._log_action('edit', self._undo[-1])
+        self._change_count += len(changes)
+        for step in self._redo:
+            self._change_count -= len(step.changes)
+        self._redo.clear()
+        while len(self._undo) > 1 and (len(self._undo) > self.max_steps
+                                       or self._change_count > self.max_changes):
+            self._change_count -= len(self._undo.popleft().changes)
+
+    def clear(self):
+        """Forget the undo and redo stacks; the operation log is kept."""
+        self._undo.clear()
+        self._redo.clear()
+        self._change_count = 0
+
+    def undo_label(self):
+        return self._undo[-1].label if self._undo else None
+
+    def redo_label(self):
+        return self._redo[-1].label if self._redo else None
+
+    def undo(self, table):
+        """Revert the latest step in table; returns it, or None if there is nothing to undo."""
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        _apply(table, reversed(step.changes), forward=False)
+        self._redo.append(step)
+        self._log_action('undo', step)
+        return step
+
+    def redo(self, table):
+        """Re-apply the latest undone step; returns it, or None if there is nothing to redo."""
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        _apply(table, step.changes, forward=True)
+        self._undo.append(step)
+        self._log_action('redo', step)
+        return step
+
+    # -------------------------------------------------------------------------
+    # Operation log
+    # -------------------------------------------------------------------------
+    def _log_action(self, action, step):
+        self._log.append((time.time(), action, step))
+        self._log_change_count += len(step.changes)
+        while len(self._log) > 1 and (len(self._log) > self.max_log
+                                      or self._log_change_count > self.max_changes):
+            self._log_change_count -= len(self._log.popleft()[2].changes)
+            self.log_dropped += 1
+
+    def to_jsonl(self, table):
+        """The operation log as JSON lines, oldest first, for audit.
+
+        Each line is one edit, undo or redo with every publication it touched:
+        GAO number, assigned topics before and after the edit, and the notes
+        splice. If older entries were dropped, a first "truncated" line says how many.
+        """
+        lines = []
+        if self.log_dropped:
+            lines.append(json.dumps({'action': 'truncated', 'dropped_entries': self.log_dropped}))
+        for logged_at, action, step in self._log:
+            lines.append(json.dumps({
+                'time': logged_at,
+                'action': action,
+                'label': step.label,
+                'changes': [_describe(table, change) for change in step.changes],
+            }))
+        return ''.join(line + '\n' for line in lines)
+
+
+def _topics(mask, listed):
+    return list(listed or mask_to_topics(mask))
+
+
+def _describe(table, change):
+    listed_before, listed_after = change.topics or ((), ())
+    if change.topics is None:
+        listed_before = listed_after = table.extra_topics(change.index)
+        before = list(mask_to_topics(change.mask_before)) + list(listed_before)
+        after = list(mask_to_topics(change.mask_after)) + list(listed_after)
+    else:
+        before = _topics(change.mask_before, listed_before)
+        after = _topics(change.mask_after, listed_after)
+    return {
+        'index': change.index,
+        'gao_number': table.gao_numbers[change.index],
+        'topics_before': before,
+        'topics_after': after,
+        'notes': list(change.notes) if change.notes is not None else None,
+    }
+
+
+def _apply(table, changes, forward):
+    for change in changes:
+        mask = change.mask_after if forward else change.mask_before
+        if change.topics is not None:
+            listed = change.topics[1] if forward else change.topics[0]
+            table.set_assigned_topics(change.index, _topics(mask, listed))
+        else:
+            table.assigned_masks[change.index] = mask
+        if change.notes is not None:
+            table.notes[change.index] = apply_notes_delta(table.notes[change.index], change.notes,
+                                                          forward)
@@ -0,0 +1,176 @@
+"""
+Lightweight timing histograms for the hot paths, exportable as Prometheus text or JSON lines
+"""
+import bisect
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+# Upper bounds in seconds (Prometheus "le" buckets); the last bucket is +Inf
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Returned by callers when instrumentation is off: entering it costs nothing
+NULL_TIMER = contextlib.nullcontext()
+
+
+class Histogram:
+    """Bucketed distribution of durations, plus count, sum, min and max."""
+
+    __slots__ = ('counts', 'count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.minimum is None or seconds < self.minimum:
+            self.minimum = seconds
+        if self.maximum is None or seconds > self.maximum:
+            self.maximum = seconds
+
+    def quantile(self, q):
+        """Estimate of the q-quantile, interpolated within its bucket as Prometheus does."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else self.maximum
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.minimum), self.maximum)
+            seen += count
+        return self.maximum
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': self.maximum,
+        }
+
+
+class MetricsRegistry:
+    """Named histograms, safe to share between sessions and threads."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self._last_written = 0.0
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def summaries(self):
+        """name -> summary dict, sorted by name."""
+        with self._lock:
+            return {name: self._histograms[name].summary() for name in sorted(self._histograms)}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.started = time.time()
+
+    # -------------------------------------------------------------------------
+    # Export
+    # -------------------------------------------------------------------------
+    def to_prometheus(self, prefix='mir_', labels=None):
+        """Prometheus text exposition format, one histogram per timer (seconds)."""
+        label_text = ','.join(f'{key}="{value}"' for key, value in sorted((labels or {}).items()))
+        lines = []
+        with self._lock:
+            for name in sorted(self._histograms):
+                histogram = self._histograms[name]
+                metric = f"{prefix}{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    bucket_labels = f'{label_text},' if label_text else ''
+                    lines.append(f'{metric}_bucket{{{bucket_labels}le="{bound}"}} {cumulative}')
+                suffix = f'{{{label_text}}}' if label_text else ''
+                lines.append(f"{metric}_sum{suffix} {histogram.total}")
+                lines.append(f"{metric}_count{suffix} {histogram.count}")
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def to_jsonl(self, labels=None):
+        """One JSON object per timer with its summary and bucket counts."""
+        now = time.time()
+        lines = []
+        with self._lock:
+            for name in sorted(self._histograms):
+                histogram = self._histograms[name]
+                record = {'time': now, 'since': self.started, 'timer': name}
+                record.update(labels or {})
+                record.update(histogram.summary())
+                record['buckets'] = dict(zip([str(bound) for bound in BUCKETS] + ['+Inf'],
+                                             histogram.counts))
+                lines.append(json.dumps(record))
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def write(self, path, labels=None):
+        """Write a snapshot to path: JSON lines are appended for .jsonl, else Prometheus text replaces it."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith('.jsonl'):
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(self.to_jsonl(labels))
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=directory or None, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus(labels=labels))
+            os.replace(tmp_path, path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+
+    def write_every(self, path, interval, labels=None):
+        """write() unless the last write was less than interval seconds ago; True if written."""
+        now = time.monotonic()
+        with self._lock:
+            if self._last_written and now - self._last_written < interval:
+                return False
+            self._last_written = now
+        self.write(path, labels)
+        return True
+
+
+class Timer:
+    """Context manager recording its elapsed time into one or more registries."""
+
+    __slots__ = ('name', 'registries', 'start')
+
+    def __init__(self, name, registries):
+        self.name = name
+        self.registries = registries
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        for registry in self.registries:
+            registry.observe(self.name, elapsed)
+        return False
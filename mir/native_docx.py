@@ -0,0 +1,311 @@
+"""
+Pandoc-free .docx reader: streams word/document.xml out of the zip with
+iterparse and emits markdown lines shaped like pandoc's output, so
+iter_publications classifies them exactly as it does pandoc's.
+"""
+import io
+import re
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+
+# Bump when the emitted markdown changes, so cached conversions are invalidated
+ENGINE_VERSION = '1'
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+FALSE_VALUES = ('0', 'false', 'off', 'none')
+HEADING_STYLE_RE = re.compile(r'^heading\s*(\d)$', re.IGNORECASE)
+HYPERLINK_FIELD_RE = re.compile(r'^\s*HYPERLINK\s+"([^"]*)"')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Pandoc's markdown writer (smart extension) renders typographic characters as ASCII
+UNSMART = str.maketrans({
+    '\u2018': "'",
+    '\u2019': "'",
+    '\u201c': '"',
+    '\u201d': '"',
+    '\u2013': '--',
+    '\u2014': '---',
+    '\u2026': '...',
+    '\u00a0': ' ',
+})
+
+# Change-tracking wrappers, as pandoc's --track-changes=all reports them
+CHANGE_TAGS = {
+    W + 'ins': 'insertion',
+    W + 'moveTo': 'insertion',
+    W + 'del': 'deletion',
+    W + 'moveFrom': 'deletion',
+}
+
+W_P = W + 'p'
+W_R = W + 'r'
+W_PPR = W + 'pPr'
+W_HYPERLINK = W + 'hyperlink'
+W_FLD_SIMPLE = W + 'fldSimple'
+
+LINE_BREAK = object()
+
+
+class NativeDocxError(ValueError):
+    """The upload is not a .docx this engine can read."""
+
+
+def iter_markdown_lines(data):
+    """Return an iterator of markdown lines (with line endings) for .docx bytes.
+
+    The package, relationships and styles are validated up front, so a file
+    this engine cannot read raises NativeDocxError before any line is produced
+    and the caller can fall back to pandoc. A body that turns out to be
+    truncated or corrupt raises NativeDocxError while lines are produced.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        archive.getinfo('word/document.xml')
+        links = _read_relationships(archive)
+        bold_styles, heading_styles = _read_styles(archive)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        raise NativeDocxError(str(e)) from e
+    return _generate_lines(archive, links, bold_styles, heading_styles)
+
+
+# =============================================================================
+# PACKAGE PARTS
+# =============================================================================
+def _read_relationships(archive):
+    """Map relationship id -> external hyperlink target."""
+    try:
+        xml = archive.read('word/_rels/document.xml.rels')
+    except KeyError:
+        return {}
+    links = {}
+    for rel in ET.fromstring(xml).iter(PKG_REL + 'Relationship'):
+        links[rel.get('Id')] = rel.get('Target', '')
+    return links
+
+
+def _read_styles(archive):
+    """Return (bold character style ids, paragraph style id -> heading level)."""
+    try:
+        xml = archive.read('word/styles.xml')
+    except KeyError:
+        return set(), {}
+
+    based_on = {}
+    own_bold = {}
+    heading_styles = {}
+    for style in ET.fromstring(xml).iter(W + 'style'):
+        style_id = style.get(W + 'styleId')
+        parent = style.find(W + 'basedOn')
+        if parent is not None:
+            based_on[style_id] = parent.get(W + 'val')
+        rpr = style.find(W + 'rPr')
+        if rpr is not None and rpr.find(W + 'b') is not None:
+            own_bold[style_id] = _is_on(rpr.find(W + 'b'))
+        name = style.find(W + 'name')
+        if style.get(W + 'type') == 'paragraph' and name is not None:
+            match = HEADING_STYLE_RE.match(name.get(W + 'val', ''))
+            if match:
+                heading_styles[style_id] = int(match.group(1))
+
+    bold_styles = set()
+    for style_id in set(based_on) | set(own_bold):
+        current, seen = style_id, set()
+        while current is not None and current not in seen:
+            if current in own_bold:
+                if own_bold[current]:
+                    bold_styles.add(style_id)
+                break
+            seen.add(current)
+            current = based_on.get(current)
+    return bold_styles, heading_styles
+
+
+def _is_on(toggle):
+    return toggle.get(W + 'val', 'true').lower() not in FALSE_VALUES
+
+
+# =============================================================================
+# DOCUMENT BODY
+# =============================================================================
+class _Paragraph:
+    """Inline content collected for one w:p."""
+
+    def __init__(self):
+        self.segments = []
+        self.prefix = ''
+
+
+class _Field:
+    """State of a complex field (w:fldChar begin/separate/end) being read.
+
+    Fields can span runs and paragraphs, so one instance lives for the whole body.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.instruction = []
+        self.in_result = False
+        self.link = None
+
+
+def _generate_lines(archive, links, bold_styles, heading_styles):
+    """Yield markdown lines paragraph by paragraph, discarding parsed XML as it goes."""
+    field = _Field()
+    try:
+        with archive, archive.open('word/document.xml') as stream:
+            for _, elem in ET.iterparse(stream):
+                if elem.tag != W_P:
+                    continue
+                paragraph = _Paragraph()
+                _walk(elem, paragraph, links, bold_styles, heading_styles, None, None, field)
+                elem.clear()
+                text = _render(paragraph)
+                if text:
+                    for line in text.split('\n'):
+                        yield line + '\n'
+                    yield '\n'
+    except (zipfile.BadZipFile, zlib.error, EOFError, ET.ParseError) as e:
+        # Malformed XML, a bad CRC or a truncated deflate stream in the body
+        raise NativeDocxError(str(e)) from e
+
+
+def _walk(parent, paragraph, links, bold_styles, heading_styles, change, link, field):
+    """Collect a paragraph's runs, tracking change and hyperlink wrappers."""
+    for child in parent:
+        tag = child.tag
+        if tag == W_R:
+            _collect_run(child, paragraph, bold_styles, change, link, field)
+        elif tag == W_PPR:
+            paragraph.prefix = _paragraph_prefix(child, heading_styles)
+        elif tag in CHANGE_TAGS:
+            _walk(child, paragraph, links, bold_styles, heading_styles,
+                  (CHANGE_TAGS[tag], child.get(W + 'author', ''), child.get(W + 'date', '')),
+                  link, field)
+        elif tag == W_HYPERLINK:
+            rel_id = child.get(R + 'id')
+            target = links.get(rel_id, '') if rel_id else '#' + child.get(W + 'anchor', '')
+            _walk(child, paragraph, links, bold_styles, heading_styles, change, target, field)
+        elif tag == W_FLD_SIMPLE:
+            match = HYPERLINK_FIELD_RE.match(child.get(W + 'instr', ''))
+            _walk(child, paragraph, links, bold_styles, heading_styles, change,
+                  match.group(1) if match else link, field)
+        elif tag != W_P and len(child):
+            # smartTag, sdt/sdtContent, customXml and similar containers
+            _walk(child, paragraph, links, bold_styles, heading_styles, change, link, field)
+
+
+def _paragraph_prefix(ppr, heading_styles):
+    style = ppr.find(W + 'pStyle')
+    if style is not None:
+        level = heading_styles.get(style.get(W + 'val'))
+        if level:
+            return '#' * level + ' '
+    if ppr.find(W + 'numPr') is not None:
+        return '-   '
+    return ''
+
+
+def _collect_run(run, paragraph, bold_styles, change, link, field):
+    """Append the text and line breaks of one w:r to the paragraph.
+
+    HYPERLINK field codes are tracked in field: the instruction text is
+    dropped and the field result is rendered as a link.
+    """
+    bold = False
+    rpr = run.find(W + 'rPr')
+    if rpr is not None:
+        toggle = rpr.find(W + 'b')
+        if toggle is not None:
+            bold = _is_on(toggle)
+        else:
+            style = rpr.find(W + 'rStyle')
+            bold = style is not None and style.get(W + 'val') in bold_styles
+
+    segments = paragraph.segments
+    for child in run:
+        tag = child.tag
+        if tag == W + 'fldChar':
+            _advance_field(field, child.get(W + 'fldCharType'))
+            continue
+        if field.depth and not field.in_result:
+            if tag == W + 'instrText':
+                field.instruction.append(child.text or '')
+            continue
+        if field.link is not None and link is None:
+            link = field.link
+
+        if tag == W + 't' or tag == W + 'delText':
+            text = child.text or ''
+        elif tag == W + 'tab':
+            text = ' '
+        elif tag == W + 'noBreakHyphen':
+            text = '-'
+        elif tag == W + 'cr' or (tag == W + 'br' and child.get(W + 'type') in (None, 'textWrapping')):
+            segments.append(LINE_BREAK)
+            continue
+        else:
+            continue
+        if not text:
+            continue
+        attrs = (bold, change, link)
+        if segments and segments[-1] is not LINE_BREAK and segments[-1][1] == attrs:
+            segments[-1][0].append(text)
+        else:
+            segments.append(([text], attrs))
+
+
+def _advance_field(field, char_type):
+    if char_type == 'begin':
+        field.depth += 1
+        if field.depth == 1:
+            field.instruction = []
+            field.in_result = False
+            field.link = None
+    elif char_type == 'separate' and field.depth == 1:
+        field.in_result = True
+        match = HYPERLINK_FIELD_RE.match(''.join(field.instruction))
+        field.link = match.group(1) if match else None
+    elif char_type == 'end' and field.depth:
+        field.depth -= 1
+        if not field.depth:
+            field.in_result = False
+            field.link = None
+
+
+def _render(paragraph):
+    """Render collected segments the way pandoc's markdown writer would."""
+    out = []
+    for segment in paragraph.segments:
+        if segment is LINE_BREAK:
+            while out and out[-1] == ' ':
+                out.pop()
+            out.append('\\\n')
+            continue
+
+        parts, (bold, change, link) = segment
+        text = WHITESPACE_RE.sub(' ', ''.join(parts).translate(UNSMART))
+        core = text.strip()
+        if not core:
+            if text and out and out[-1] not in (' ', '\\\n'):
+                out.append(' ')
+            continue
+
+        if link is not None:
+            core = f"<{link}>" if core == link else f"[{core}]({link})"
+        if bold:
+            core = f"**{core}**"
+        if change is not None:
+            kind, author, date = change
+            core = f'[{core}]{{.{kind} author="{author}" date="{date}"}}'
+
+        if text[0] == ' ' and out and out[-1] not in (' ', '\\\n'):
+            out.append(' ')
+        out.append(core)
+        if text[-1] == ' ':
+            out.append(' ')
+
+    return (paragraph.prefix + ''.join(out)).strip()
@@ -0,0 +1,158 @@
+"""
+Month in Review markdown parser
+"""
+import re
+from operator import itemgetter
+
+from mir.topics import normalize_topic_name
+
+# =============================================================================
+# PATTERNS
+# =============================================================================
+TOPIC_HEADER_RE = re.compile(r'^\*\*[A-Z][A-Z\s&]+\*\*\\$')
+GAO_START_RE = re.compile(r'GAO-\d+-\d+')
+GAO_META_RE = re.compile(r'(GAO-\d+-\d+),\s*(.+)')
+REPORT_URL_RE = re.compile(r'https://www\.gao\.gov/products/(GAO-\d+-\d+)')
+
+# Parser states
+_SCAN = 0
+_TITLE = 1
+_META = 2
+
+
+def _strip_markup(line):
+    return line.replace('**', '').replace('\\', '').strip()
+
+
+def parse_markdown(content):
+    """Parse markdown content and extract publications, sorted by GAO number."""
+    publications = list(iter_publications(content.split('\n')))
+    publications.sort(key=itemgetter('gao_number'))
+    return publications
+
+
+def merge_documents(documents, index=None):
+    """Merge per-document publication lists into one list, in document order.
+
+    documents is an iterable of (source, publications). The first record seen
+    for a GAO number is kept; later ones add their current_topics (union, in
+    order of appearance) and their source to it. Every merged record gets a
+    sources list naming the documents it appeared in.
+    """
+    pubs_dict = {} if index is None else index
+    merged = []
+    for source, publications in documents:
+        for pub in publications:
+            existing = pubs_dict.get(pub['gao_number'])
+            if existing is None:
+                pub['sources'] = [source]
+                pubs_dict[pub['gao_number']] = pub
+                merged.append(pub)
+                continue
+            for topic in pub['current_topics']:
+                if topic not in existing['current_topics']:
+                    existing['current_topics'].append(topic)
+            sources = existing.setdefault('sources', [])
+            if source not in sources:
+                sources.append(source)
+    return merged
+
+
+def iter_publications(lines, index=None):
+    """Yield publications from an iterable of markdown lines as each one completes.
+
+    Single pass over the lines: each line is cleaned and classified once as a
+    topic header, title fragment, metadata line or report URL. Lines may carry
+    their trailing newline, so a file handle or pandoc's stdout works directly.
+
+    Publications are yielded in document order, the first time their GAO number
+    is seen. A repeat under another topic is merged into the record already
+    yielded (its current_topics list grows in place) and is not yielded again.
+    index maps GAO number -> record; pass a shared dict to merge across documents.
+    """
+    pubs_dict = {} if index is None else index
+    current_topic = None
+    state = _SCAN
+
+    # Publication being collected
+    title_parts = []
+    pub_topic = None
+    gao_num = None
+    date = None
+
+    for raw_line in lines:
+        # Clean table formatting if present (some MIR docs are wrapped in tables)
+        # | | content | | becomes content; borders (+---) and rules (=) are dropped
+        if '|' in raw_line:
+            line = raw_line.replace('| |', '').replace('|', '').strip()
+        else:
+            line = raw_line.strip()
+        if not line or line[0] == '=' or line.startswith('+---'):
+            continue
+
+        if state == _SCAN:
+            if not line.startswith('**'):
+                continue
+            if TOPIC_HEADER_RE.match(line):
+                current_topic = normalize_topic_name(_strip_markup(line))
+                continue
+            if 'Month in Review' in line or 'LEGAL PRODUCTS' in line:
+                continue
+            state = _TITLE
+            title_parts = []
+            pub_topic = current_topic
+            gao_num = None
+            date = None
+
+        if state == _TITLE:
+            if line.startswith('GAO-') and GAO_START_RE.match(line):
+                state = _META
+            else:
+                clean = _strip_markup(line)
+                if clean:
+                    title_parts.append(clean)
+                if line.endswith('**\\'):
+                    state = _META
+                continue
+
+        # state == _META
+        if 'GAO-' in line:
+            gao_match = GAO_META_RE.search(line)
+            if gao_match:
+                gao_num = gao_match.group(1)
+                date = gao_match.group(2)
+            url_match = REPORT_URL_RE.search(line)
+            if url_match:
+                pub = _add_publication(pubs_dict, gao_num, title_parts, date, pub_topic,
+                                       f"https://www.gao.gov/products/{url_match.group(1)}")
+                if pub is not None:
+                    yield pub
+                state = _SCAN
+
+    if state == _META:
+        pub = _add_publication(pubs_dict, gao_num, title_parts, date, pub_topic, None)
+        if pub is not None:
+            yield pub
+
+
+def _add_publication(pubs_dict, gao_num, title_parts, date, topic, report_url):
+    """Record a parsed publication, merging topics for repeated GAO numbers.
+
+    Returns the new record, or None if nothing new was added.
+    """
+    if not gao_num:
+        return None
+    existing = pubs_dict.get(gao_num)
+    if existing is not None:
+        if topic and topic not in existing['current_topics']:
+            existing['current_topics'].append(topic)
+        return None
+    pub = pubs_dict[gao_num] = {
+        'gao_number': gao_num,
+        'title': ' '.join(title_parts),
+        'date': date,
+        'current_topics': [topic] if topic else [],
+        'report_url': report_url or f"https://www.gao.gov/products/{gao_num}",
+        'notes': ''
+    }
+    return pub
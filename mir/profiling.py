@@ -0,0 +1,117 @@
+"""
+cProfile + tracemalloc capture of individual script runs, saved for offline analysis
+"""
+import cProfile
+import glob
+import io
+import os
+import pstats
+import time
+import tracemalloc
+
+# Stack depth kept per allocation; deeper is more useful and slower
+TRACEBACK_FRAMES = 10
+TOP_ALLOCATIONS = 50
+TOP_FUNCTIONS = 25
+
+_IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+)
+
+
+class RunCapture:
+    """Profiles one script run.
+
+    cProfile covers the calling thread only. tracemalloc is process-wide, so
+    allocations made by other sessions during the run are included too. If
+    another capture is already tracing (or another profiler is active), that
+    half of the capture is skipped rather than disturbing it.
+    """
+
+    def __init__(self, directory, label):
+        self.directory = directory
+        self.label = label
+        self.profiler = None
+        self.tracing = False
+        self.started = None
+
+    def start(self):
+        self.profiler = cProfile.Profile()
+        try:
+            self.profiler.enable()
+        except ValueError:
+            # Python 3.12+: another profiling tool is already active
+            self.profiler = None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEBACK_FRAMES)
+            self.tracing = True
+        self.started = time.perf_counter()
+        return self
+
+    def stop(self):
+        """Stop capturing and write the files; returns a dict describing them."""
+        seconds = time.perf_counter() - self.started
+        if self.profiler is not None:
+            self.profiler.disable()
+        snapshot = None
+        peak = None
+        if self.tracing:
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self.tracing = False
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.label}")
+        result = {'label': self.label, 'seconds': seconds, 'peak_memory_bytes': peak,
+                  'profile_path': None, 'allocations_path': None, 'summary': ''}
+
+        if self.profiler is not None:
+            result['profile_path'] = base + '.prof'
+            self.profiler.dump_stats(result['profile_path'])
+            out = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=out)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+            result['summary'] = out.getvalue()
+
+        if snapshot is not None:
+            result['allocations_path'] = base + '-allocations.txt'
+            with open(result['allocations_path'], 'w', encoding='utf-8') as f:
+                f.write(f"Peak traced memory during the run: {peak / 1024:.1f} KiB\n")
+                f.write(format_allocations(snapshot.filter_traces(_IGNORED_FRAMES)))
+        return result
+
+
+def prune_captures(directory, keep):
+    """Delete the files of all but the newest keep runs saved in directory."""
+    runs = {}
+    for path in glob.glob(os.path.join(directory, '*.prof')) + \
+            glob.glob(os.path.join(directory, '*-allocations.txt')):
+        base = path[:-len('.prof')] if path.endswith('.prof') else path[:-len('-allocations.txt')]
+        try:
+            modified = os.path.getmtime(path)
+        except OSError:
+            continue
+        paths, newest = runs.get(base, ([], 0.0))
+        runs[base] = (paths + [path], max(newest, modified))
+    ranked = sorted(runs.values(), key=lambda run: run[1], reverse=True)
+    for paths, _ in ranked[max(keep, 0):]:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def format_allocations(snapshot, limit=TOP_ALLOCATIONS):
+    """Top allocation sites (live at snapshot time) as text, largest first."""
+    statistics = snapshot.statistics('traceback')
+    total = sum(stat.size for stat in statistics)
+    lines = [f"{len(statistics)} allocation sites, {total / 1024:.1f} KiB live", ""]
+    for rank, stat in enumerate(statistics[:limit], 1):
+        lines.append(f"#{rank}: {stat.size / 1024:.1f} KiB in {stat.count} blocks")
+        lines.extend(f"    {line}" for line in stat.traceback.format(most_recent_first=True))
+        lines.append("")
+    return '\n'.join(lines)
@@ -0,0 +1,94 @@
+"""
+Runtime settings, read once from environment variables
+"""
+import os
+import tempfile
+
+
+def _env_flag(name, default=False):
+    """Read a boolean environment variable (1/true/yes/on)."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _env_int(name, default):
+    """Read an integer environment variable, falling back to default."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+# =============================================================================
+# CONVERSION CACHE
+# =============================================================================
+CACHE_DIR = os.environ.get(
+    'MIR_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'gao-mir-cache')
+)
+CACHE_MEMORY_MB = _env_int('MIR_CACHE_MEMORY_MB', 64)
+CACHE_DISK_MB = _env_int('MIR_CACHE_DISK_MB', 512)
+
+# =============================================================================
+# CONVERSION
+# =============================================================================
+# 'pipe' streams the upload through pandoc's stdin/stdout; 'tempfile' is the
+# original write-to-disk round trip, kept for pandoc builds that cannot read
+# .docx from stdin.
+PANDOC_MODE = os.environ.get('MIR_PANDOC_MODE', 'pipe')
+
+# 'native' reads the .docx in-process and only falls back to pandoc for files
+# it cannot open; 'pandoc' always runs pandoc.
+CONVERSION_ENGINE = os.environ.get('MIR_CONVERSION_ENGINE', 'native')
+
+# Size of the shared conversion process pool; 0 converts in the script thread
+# and streams lines to the parser as they are produced.
+CONVERSION_WORKERS = _env_int('MIR_CONVERSION_WORKERS', os.cpu_count() or 1)
+
+# =============================================================================
+# PERSISTENCE
+# =============================================================================
+DATA_DIR = os.environ.get('MIR_DATA_DIR', os.path.join(os.path.expanduser('~'), '.gao-mir'))
+# Review session log; set MIR_SESSION_DB to an empty string to disable it
+SESSION_DB = os.environ.get('MIR_SESSION_DB', os.path.join(DATA_DIR, 'sessions.sqlite3'))
+# Every publication ever loaded, with its latest reviewed topics, for
+# cross-month lookups; set MIR_ARCHIVE_DB to an empty string to disable it
+ARCHIVE_DB = os.environ.get('MIR_ARCHIVE_DB', os.path.join(DATA_DIR, 'archive.sqlite3'))
+# Past review CSVs (app export format) the topic suggestions also learn from,
+# besides the reviewed publications in the archive
+TRAINING_DIR = os.environ.get('MIR_TRAINING_DIR', os.path.join(DATA_DIR, 'training'))
+
+# =============================================================================
+# REVIEW
+# =============================================================================
+# Default suggestion confidence (percent) at which the fast lane accepts a
+# publication's topics without a review
+TRIAGE_CONFIDENCE = _env_int('MIR_TRIAGE_CONFIDENCE', 80)
+# Minimum seconds between retrains of the topic suggestion model as reviews are added
+SUGGEST_RETRAIN_SECONDS = _env_int('MIR_SUGGEST_RETRAIN_SECONDS', 300)
+
+# Undo history per session: the oldest steps are dropped past either limit
+HISTORY_STEPS = _env_int('MIR_HISTORY_STEPS', 100)
+HISTORY_CHANGES = _env_int('MIR_HISTORY_CHANGES', 50000)
+
+# =============================================================================
+# INSTRUMENTATION
+# =============================================================================
+# Hot-path timers and the sidebar timing panel; off by default
+METRICS = _env_flag('MIR_METRICS')
+# Process-wide timings are also written here: Prometheus text, or JSON lines
+# appended for a .jsonl path
+METRICS_FILE = os.environ.get('MIR_METRICS_FILE', '')
+METRICS_FILE_INTERVAL = _env_int('MIR_METRICS_FILE_INTERVAL', 60)
+
+# Profile each session's first N script runs with cProfile + tracemalloc
+# (?profile=N in the URL does the same for one session)
+PROFILE_RUNS = _env_int('MIR_PROFILE_RUNS', 0)
+PROFILE_DIR = os.environ.get('MIR_PROFILE_DIR', os.path.join(DATA_DIR, 'profiles'))
+# Most runs one ?profile=N may ask for, and runs whose files PROFILE_DIR keeps
+PROFILE_MAX_RUNS = _env_int('MIR_PROFILE_MAX_RUNS', 5)
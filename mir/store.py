@@ -0,0 +1,252 @@
+"""
+Durable review sessions: documents, publications and review events in SQLite
+"""
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_key TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    loaded_at REAL NOT NULL,
+    publication_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS publications (
+    doc_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    gao_number TEXT NOT NULL,
+    title TEXT NOT NULL,
+    date TEXT,
+    current_topics TEXT NOT NULL,
+    report_url TEXT NOT NULL,
+    sources TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (doc_key, position)
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_key TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    action TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    gao_number TEXT NOT NULL,
+    assigned_topics TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    next_index INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_doc ON events (doc_key, position, id);
+"""
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+def _migrate(conn):
+    """Bring databases created by older versions up to SCHEMA."""
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(publications)')}
+    if 'sources' not in columns:
+        conn.execute("ALTER TABLE publications ADD COLUMN sources TEXT NOT NULL DEFAULT '[]'")
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    # WAL + NORMAL: commits don't fsync; the log is synced at checkpoints
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+class BatchWriter:
+    """Background thread applying queued (sql, rows) writes in batched transactions.
+
+    Callers never wait on disk; flush() blocks until everything queued so far
+    has been committed.
+    """
+
+    def __init__(self, path, batch_size=500, name='mir-sqlite-writer'):
+        self.path = path
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, sql, rows):
+        self._queue.put((sql, rows))
+
+    def flush(self):
+        """Block until every queued write has been committed."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _write_loop(self):
+        conn = connect(self.path)
+        stopping = False
+        while not stopping:
+            # Everything queued while the previous batch was committing goes in one transaction
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            writes = [item for item in batch if item is not _STOP]
+            stopping = len(writes) != len(batch)
+            try:
+                with conn:
+                    for sql, rows in writes:
+                        conn.executemany(sql, rows)
+            except sqlite3.Error:
+                logger.exception("Write to %s failed", self.path)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+
+class SessionStore:
+    """Append-only log of review work, so a restart never loses a session.
+
+    Writes are queued and applied by one background thread in batched
+    transactions; callers never wait on disk. Reads flush the queue first so
+    they always see every write made before them.
+    """
+
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = connect(path)
+        with conn:
+            conn.executescript(SCHEMA)
+            _migrate(conn)
+        conn.close()
+
+        self._writer = BatchWriter(path, batch_size, name='mir-session-store')
+
+    # -------------------------------------------------------------------------
+    # Writes (asynchronous)
+    # -------------------------------------------------------------------------
+    def record_document(self, doc_key, file_name, publications):
+        """Store a loaded document and its parsed publications (once per doc_key)."""
+        self._writer.put(
+            'INSERT OR IGNORE INTO documents VALUES (?, ?, ?, ?)',
+            [(doc_key, file_name, time.time(), len(publications))],
+        )
+        self._writer.put(
+            'INSERT OR IGNORE INTO publications VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [(doc_key, position, pub['gao_number'], pub['title'], pub['date'],
+              json.dumps(pub['current_topics']), pub['report_url'],
+              json.dumps(pub.get('sources') or []))
+             for position, pub in enumerate(publications)],
+        )
+
+    def record_event(self, doc_key, session_id, action, position, pub, next_index):
+        """Append one review action (save_next, no_changes, previous, ...)."""
+        self._writer.put(
+            'INSERT INTO events (doc_key, session_id, created_at, action, position, '
+            'gao_number, assigned_topics, notes, next_index) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(doc_key, session_id, time.time(), action, position, pub['gao_number'],
+              json.dumps(pub.get('assigned_topics', pub['current_topics'])),
+              pub.get('notes', ''), next_index)],
+        )
+
+    def record_events(self, doc_key, session_id, action, edits, next_index):
+        """Append one action that touched many publications; edits are (position, pub) pairs."""
+        now = time.time()
+        self._writer.put(
+            'INSERT INTO events (doc_key, session_id, created_at, action, position, '
+            'gao_number, assigned_topics, notes, next_index) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(doc_key, session_id, now, action, position, pub['gao_number'],
+              json.dumps(pub.get('assigned_topics', pub['current_topics'])),
+              pub.get('notes', ''), next_index) for position, pub in edits],
+        )
+
+    def flush(self):
+        """Block until every queued write has been committed."""
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+    def load_session(self, doc_key):
+        """Rebuild a stored document's review state.
+
+        Returns (publications, current_index, event_count), or None if the
+        document has never been loaded. Each publication gets the topics and
+        notes from its most recent event; the index is where the last event
+        left the reviewer.
+        """
+        self.flush()
+        conn = connect(self.path)
+        try:
+            rows = conn.execute(
+                'SELECT gao_number, title, date, current_topics, report_url, sources FROM publications '
+                'WHERE doc_key = ? ORDER BY position', (doc_key,)
+            ).fetchall()
+            if not rows:
+                return None
+            publications = [{
+                'gao_number': gao_number,
+                'title': title,
+                'date': date,
+                'current_topics': json.loads(current_topics),
+                'report_url': report_url,
+                'notes': '',
+                'sources': json.loads(sources)
+            } for gao_number, title, date, current_topics, report_url, sources in rows]
+
+            latest = conn.execute(
+                'SELECT position, assigned_topics, notes FROM events WHERE id IN '
+                '(SELECT MAX(id) FROM events WHERE doc_key = ? GROUP BY position)', (doc_key,)
+            ).fetchall()
+            for position, assigned_topics, notes in latest:
+                if position < len(publications):
+                    publications[position]['assigned_topics'] = json.loads(assigned_topics)
+                    publications[position]['notes'] = notes
+
+            count, next_index = conn.execute(
+                'SELECT COUNT(*), (SELECT next_index FROM events WHERE doc_key = ?1 '
+                'ORDER BY id DESC LIMIT 1) FROM events WHERE doc_key = ?1', (doc_key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return publications, next_index or 0, count
+
+    def export_events(self, doc_key):
+        """Every review event of a document as JSON lines, oldest first (the audit trail)."""
+        self.flush()
+        conn = connect(self.path)
+        try:
+            rows = conn.execute(
+                'SELECT id, created_at, session_id, action, position, gao_number, assigned_topics, '
+                'notes, next_index FROM events WHERE doc_key = ? ORDER BY id', (doc_key,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return ''.join(json.dumps({
+            'id': event_id,
+            'time': created_at,
+            'session_id': session_id,
+            'action': action,
+            'position': position,
+            'gao_number': gao_number,
+            'assigned_topics': json.loads(assigned_topics),
+            'notes': notes,
+            'next_index': next_index,
+        }) + '\n' for (event_id, created_at, session_id, action, position, gao_number,
+                       assigned_topics, notes, next_index) in rows)
@@ -0,0 +1,213 @@
+"""
+Topic suggestions from past reviews: nearest neighbours over TF-IDF title vectors
+"""
+import collections
+import glob
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+from mir.archive import title_terms
+from mir.export import read_csv_records
+
+K_NEIGHBOURS = 10
+# Title postings scanned per publication, rarest terms first: common words
+# ("federal", "agencies") cover much of the training set and say little
+MAX_POSTINGS = 2000
+# Suggestions below this confidence are dropped
+MIN_CONFIDENCE = 0.1
+# Original topics are features too: what the document's header says is a
+# strong hint, but titles decide between publications under the same header
+TOPIC_FEATURE = 'topic:'
+
+
+def features(pub):
+    """Title terms plus original topics of a publication."""
+    return title_terms(pub['title']) + [TOPIC_FEATURE + topic for topic in pub['current_topics']]
+
+
+def load_training_records(archive=None, csv_dir=None):
+    """Reviewed publications from the archive and from past CSV exports in csv_dir.
+
+    A GAO number reviewed more than once counts once, with its latest
+    assignment; archive records win over CSVs.
+    """
+    records = {}
+    if csv_dir and os.path.isdir(csv_dir):
+        for path in sorted(glob.glob(os.path.join(csv_dir, '*.csv'))):
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                for record in read_csv_records(f):
+                    records[record['gao_number']] = record
+    if archive is not None:
+        for record in archive.iter_reviewed():
+            records[record['gao_number']] = {
+                'gao_number': record['gao_number'],
+                'title': record['title'],
+                'current_topics': record['original_topics'],
+                'assigned_topics': record['assigned_topics'],
+            }
+    return list(records.values())
+
+
+class TopicSuggester:
+    """Ranks topics for a publication by the assignments of its most similar reviewed ones.
+
+    Each reviewed publication is a unit-length TF-IDF vector over its
+    features() and is labelled with its assigned topics. A publication's k
+    nearest neighbours (cosine similarity, found through an inverted index)
+    vote for their topics with their similarity; a topic's confidence is its
+    share of the neighbours' total similarity, so a topic every neighbour has
+    scores 1.0.
+
+    Scoring work is bounded whatever the training set size. Candidates come
+    from at most max_postings title postings, rarest terms first and the
+    heaviest entries of each, plus the k heaviest examples of each original
+    topic; topic features, whose postings cover a 31st of the training set
+    each, are only looked up for those candidates.
+    """
+
+    def __init__(self, records, k=K_NEIGHBOURS, max_postings=MAX_POSTINGS):
+        self.k = k
+        self.max_postings = max_postings
+        self.labels = []
+        self.idf = {}
+        self.postings = {}
+        # Per example, its (topic feature, weight) pairs
+        self.topic_weights = []
+
+        examples = []
+        document_frequency = {}
+        for record in records:
+            terms = set(features(record))
+            topics = tuple(record.get('assigned_topics', record['current_topics']))
+            if not terms or not topics:
+                continue
+            examples.append(terms)
+            self.labels.append(topics)
+            for term in terms:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        count = len(examples)
+        self.idf = {term: math.log((1 + count) / (1 + df)) + 1
+                    for term, df in document_frequency.items()}
+        for example, terms in enumerate(examples):
+            topic_weights = []
+            for term, weight in self._weights(terms):
+                self.postings.setdefault(term, []).append((example, weight))
+                if term.startswith(TOPIC_FEATURE):
+                    topic_weights.append((term, weight))
+            self.topic_weights.append(tuple(topic_weights))
+        for term, posting in self.postings.items():
+            posting.sort(key=itemgetter(1), reverse=True)
+            if term.startswith(TOPIC_FEATURE):
+                del posting[k:]
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _weights(self, terms):
+        """(term, weight) of the unit-length TF-IDF vector of terms seen in training."""
+        weights = [(term, self.idf[term]) for term in terms if term in self.idf]
+        norm = math.sqrt(sum(weight * weight for _, weight in weights))
+        return [(term, weight / norm) for term, weight in weights] if norm else []
+
+    def suggest(self, pub, limit=5):
+        """[(topic, confidence)] for one publication, most confident first."""
+        weights = self._weights(set(features(pub)))
+        topic_weights = {term: weight for term, weight in weights if term.startswith(TOPIC_FEATURE)}
+        title_weights = sorted(((term, weight) for term, weight in weights if term not in topic_weights),
+                               key=lambda item: len(self.postings[item[0]]))
+
+        scores = {}
+        budget = self.max_postings
+        for term, weight in title_weights:
+            if budget <= 0:
+                break
+            posting = self.postings[term]
+            for example, example_weight in itertools.islice(posting, budget):
+                scores[example] = scores.get(example, 0.0) + weight * example_weight
+            budget -= len(posting)
+        if topic_weights:
+            for term in topic_weights:
+                for example, _ in self.postings[term]:
+                    scores.setdefault(example, 0.0)
+            for example in scores:
+                for term, example_weight in self.topic_weights[example]:
+                    if term in topic_weights:
+                        scores[example] += topic_weights[term] * example_weight
+
+        neighbours = heapq.nlargest(self.k, scores.items(), key=itemgetter(1))
+        total = sum(similarity for _, similarity in neighbours)
+        if not total:
+            return []
+        votes = {}
+        for example, similarity in neighbours:
+            for topic in self.labels[example]:
+                votes[topic] = votes.get(topic, 0.0) + similarity
+        ranked = sorted(((topic, vote / total) for topic, vote in votes.items()),
+                        key=itemgetter(1), reverse=True)
+        return [(topic, confidence) for topic, confidence in ranked[:limit]
+                if confidence >= MIN_CONFIDENCE]
+
+    def suggest_many(self, publications, limit=5):
+        """suggest() for every publication, in order; run once per loaded document."""
+        if not self.labels:
+            return [[] for _ in publications]
+        return [self.suggest(pub, limit) for pub in publications]
+
+
+class SuggestionService:
+    """Trains a TopicSuggester and scores documents on one background thread.
+
+    submit() returns a Future of suggest_many() for a document, so loading a
+    document never waits for training or scoring. Results are kept per
+    doc_key: submitting a document again (a resume, a re-upload) reuses them
+    while the model is current. load_records() is called on the worker to
+    (re)train; the model is retrained when the reviewed count has changed,
+    at most once every retrain_interval seconds.
+    """
+
+    def __init__(self, load_records, retrain_interval=300, max_documents=32):
+        self.load_records = load_records
+        self.retrain_interval = retrain_interval
+        self.max_documents = max_documents
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mir-suggest')
+        self._lock = threading.Lock()
+        self._results = collections.OrderedDict()
+        self._model = None
+        self._trained_count = None
+        self._trained_at = 0.0
+
+    def submit(self, doc_key, publications, reviewed_count):
+        """Future of the suggestions for publications (titles and original topics are read now)."""
+        with self._lock:
+            future = self._results.get(doc_key)
+            if future is not None and (not future.done() or not self._stale(reviewed_count)):
+                self._results.move_to_end(doc_key)
+                return future
+            inputs = [{'title': pub['title'], 'current_topics': list(pub['current_topics'])}
+                      for pub in publications]
+            future = self._results[doc_key] = self._executor.submit(self._score, inputs,
+                                                                    reviewed_count)
+            while len(self._results) > self.max_documents:
+                self._results.popitem(last=False)
+            return future
+
+    def _stale(self, reviewed_count):
+        return self._model is None or (reviewed_count != self._trained_count and
+                                       time.monotonic() - self._trained_at >= self.retrain_interval)
+
+    def _score(self, publications, reviewed_count):
+        if self._stale(reviewed_count):
+            self._model = TopicSuggester(self.load_records())
+            self._trained_count = reviewed_count
+            self._trained_at = time.monotonic()
+        return self._model.suggest_many(publications)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
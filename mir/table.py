@@ -0,0 +1,296 @@
+"""
+Columnar publication table with topic membership stored as bitmasks
+"""
+from array import array
+
+from mir.topics import TOPIC_BITS, mask_to_topics, topics_to_mask
+
+# Smallest unsigned array type that holds the 31 topic bits
+MASK_TYPECODE = 'I' if array('I').itemsize >= 4 else 'L'
+
+FIELDS = ('gao_number', 'title', 'date', 'current_topics', 'assigned_topics',
+          'report_url', 'notes', 'sources')
+
+
+def default_report_url(gao_number):
+    return f"https://www.gao.gov/products/{gao_number}"
+
+
+class PublicationTable:
+    """Publications stored column by column.
+
+    Text fields are plain lists; original and assigned topics are one int
+    bitmask per row (bit i = ALL_TOPICS[i]), so topic queries, diffs and
+    exports work on whole columns with integer operations. The rare topics
+    outside ALL_TOPICS and non-default report URLs are kept in sparse dicts.
+
+    Indexing returns a PublicationRow, a dict-like view, so code written
+    against the old list of dicts (pub['title'], pub.get('notes', '')) keeps
+    working. Topic lists come back in ALL_TOPICS order, extras last, unless
+    they were given in another order (a document listing a publication under
+    an unmapped header first): such rows keep that order in a sparse dict.
+    """
+
+    def __init__(self):
+        self.gao_numbers = []
+        self.titles = []
+        self.dates = []
+        self.notes = []
+        self.sources = []
+        self.original_masks = array(MASK_TYPECODE)
+        self.assigned_masks = array(MASK_TYPECODE)
+        self._report_urls = {}
+        self._original_extras = {}
+        self._assigned_extras = {}
+        self._original_order = {}
+        self._assigned_order = {}
+        self._search_keys = None
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a table from publication dicts (parse_markdown output)."""
+        table = cls()
+        for record in records:
+            table.append(record)
+        return table
+
+    def append(self, record):
+        self._search_keys = None
+        index = len(self.gao_numbers)
+        gao_number = record['gao_number']
+        self.gao_numbers.append(gao_number)
+        self.titles.append(record['title'])
+        self.dates.append(record['date'])
+        self.notes.append(record.get('notes', ''))
+        self.sources.append(tuple(record.get('sources', ())))
+
+        topics = record['current_topics']
+        mask, extras = topics_to_mask(topics)
+        self.original_masks.append(mask)
+        if extras:
+            self._original_extras[index] = extras
+        if _custom_order(topics, mask, extras):
+            self._original_order[index] = list(topics)
+        if 'assigned_topics' in record:
+            topics = record['assigned_topics']
+            mask, extras = topics_to_mask(topics)
+        self.assigned_masks.append(mask)
+        if extras:
+            self._assigned_extras[index] = list(extras)
+        if _custom_order(topics, mask, extras):
+            self._assigned_order[index] = list(topics)
+
+        report_url = record.get('report_url')
+        if report_url and report_url != default_report_url(gao_number):
+            self._report_urls[index] = report_url
+
+    def to_records(self):
+        """Plain publication dicts, e.g. for JSON."""
+        return [row.to_dict() for row in self]
+
+    # -------------------------------------------------------------------------
+    # Sequence protocol
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        return len(self.gao_numbers)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return PublicationRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield PublicationRow(self, index)
+
+    # -------------------------------------------------------------------------
+    # Topics
+    # -------------------------------------------------------------------------
+    def original_topics(self, index):
+        return _ordered_topics(self.original_masks[index], self._original_extras.get(index, []),
+                               self._original_order.get(index))
+
+    def assigned_topics(self, index):
+        return _ordered_topics(self.assigned_masks[index], self._assigned_extras.get(index, []),
+                               self._assigned_order.get(index))
+
+    def set_assigned_topics(self, index, topics):
+        mask, extras = topics_to_mask(topics)
+        self.assigned_masks[index] = mask
+        if extras:
+            self._assigned_extras[index] = extras
+        else:
+            self._assigned_extras.pop(index, None)
+        if _custom_order(topics, mask, extras):
+            self._assigned_order[index] = list(topics)
+        else:
+            self._assigned_order.pop(index, None)
+
+    def set_original_topics(self, index, topics):
+        mask, extras = topics_to_mask(topics)
+        self.original_masks[index] = mask
+        if extras:
+            self._original_extras[index] = extras
+        else:
+            self._original_extras.pop(index, None)
+        if _custom_order(topics, mask, extras):
+            self._original_order[index] = list(topics)
+        else:
+            self._original_order.pop(index, None)
+
+    def extra_topics(self, index, assigned=True):
+        """Topics outside ALL_TOPICS for one row."""
+        extras = self._assigned_extras if assigned else self._original_extras
+        return extras.get(index, [])
+
+    def listed_topics(self, index):
+        """Assigned topics as a tuple where the mask alone can't give them back
+        (topics outside ALL_TOPICS, or a custom order), else ()."""
+        if index in self._assigned_extras or index in self._assigned_order:
+            return tuple(self.assigned_topics(index))
+        return ()
+
+    def extra_topic_rows(self):
+        """Indices of rows with topics outside ALL_TOPICS, originally or as assigned."""
+        return sorted(set(self._original_extras) | set(self._assigned_extras))
+
+    def rows_with_topic(self, topic, assigned=True):
+        """Indices of publications carrying topic."""
+        bit = TOPIC_BITS[topic]
+        masks = self.assigned_masks if assigned else self.original_masks
+        return [index for index, mask in enumerate(masks) if mask & bit]
+
+    def search(self, text='', topics=(), status=None):
+        """Indices of rows matching every given filter, in table order.
+
+        text matches the GAO number or title, case-insensitively; topics keeps
+        rows assigned any of them; status is 'changed' or 'unchanged' to
+        compare assigned with original topics.
+        """
+        masks = self.assigned_masks
+        indices = range(len(self))
+        if text:
+            if self._search_keys is None:
+                self._search_keys = [f"{gao_number}\n{title}".lower()
+                                     for gao_number, title in zip(self.gao_numbers, self.titles)]
+            text = text.lower()
+            indices = [index for index in indices if text in self._search_keys[index]]
+        if topics:
+            wanted, extras = topics_to_mask(topics)
+            indices = [index for index in indices
+                       if masks[index] & wanted
+                       or (extras and any(t in extras for t in self._assigned_extras.get(index, ())))]
+        if status is not None:
+            originals = self.original_masks
+            want_changed = status == 'changed'
+            indices = [index for index in indices
+                       if (masks[index] != originals[index]
+                           or self._assigned_extras.get(index) != self._original_extras.get(index))
+                       == want_changed]
+        return list(indices)
+
+    def topic_counts(self, assigned=True):
+        """Number of publications per official topic, in ALL_TOPICS order."""
+        masks = self.assigned_masks if assigned else self.original_masks
+        return {topic: sum(1 for mask in masks if mask & bit)
+                for topic, bit in TOPIC_BITS.items()}
+
+    # -------------------------------------------------------------------------
+    # Other fields
+    # -------------------------------------------------------------------------
+    def source_names(self):
+        """Distinct source documents, in order of first appearance."""
+        return list(dict.fromkeys(name for sources in self.sources for name in sources))
+
+    def report_url(self, index):
+        return self._report_urls.get(index) or default_report_url(self.gao_numbers[index])
+
+    def get_field(self, index, field):
+        if field == 'gao_number':
+            return self.gao_numbers[index]
+        if field == 'title':
+            return self.titles[index]
+        if field == 'date':
+            return self.dates[index]
+        if field == 'notes':
+            return self.notes[index]
+        if field == 'current_topics':
+            return self.original_topics(index)
+        if field == 'assigned_topics':
+            return self.assigned_topics(index)
+        if field == 'report_url':
+            return self.report_url(index)
+        if field == 'sources':
+            return list(self.sources[index])
+        raise KeyError(field)
+
+    def set_field(self, index, field, value):
+        if field == 'assigned_topics':
+            self.set_assigned_topics(index, value)
+        elif field == 'notes':
+            self.notes[index] = value
+        elif field == 'current_topics':
+            self.set_original_topics(index, value)
+        elif field == 'title':
+            self.titles[index] = value
+            self._search_keys = None
+        elif field == 'date':
+            self.dates[index] = value
+        else:
+            raise KeyError(field)
+
+
+def _custom_order(topics, mask, extras):
+    """Whether topics differ in order from what mask and extras give back."""
+    return len(topics) > 1 and list(topics) != list(mask_to_topics(mask)) + extras
+
+
+def _ordered_topics(mask, extras, order):
+    """Topics of mask and extras, following order where given.
+
+    Topics no longer set are skipped and ones added since come last, so
+    masks edited in place (bulk edits, undo) need no bookkeeping here.
+    """
+    topics = list(mask_to_topics(mask)) + extras
+    if order is None:
+        return topics
+    present = set(topics)
+    kept = [topic for topic in order if topic in present]
+    return kept + [topic for topic in topics if topic not in kept]
+
+
+class PublicationRow:
+    """Dict-like view of one table row."""
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, field):
+        return self.table.get_field(self.index, field)
+
+    def __setitem__(self, field, value):
+        self.table.set_field(self.index, field, value)
+
+    def __contains__(self, field):
+        return field in FIELDS
+
+    def get(self, field, default=None):
+        try:
+            return self.table.get_field(self.index, field)
+        except KeyError:
+            return default
+
+    def keys(self):
+        return FIELDS
+
+    def to_dict(self):
+        return {field: self.table.get_field(self.index, field) for field in FIELDS}
+
+    def __repr__(self):
+        return f"PublicationRow({self.to_dict()!r})"
+
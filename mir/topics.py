@@ -0,0 +1,114 @@
+"""
+Official GAO topic list and the mapping from Month in Review headers
+"""
+import functools
+
+ALL_TOPICS = [
+    "Agriculture and Food",
+    "Auditing and Financial Management",
+    "Budget and Spending",
+    "Business Regulation and Consumer Protection",
+    "Economic Development",
+    "Education",
+    "Employment",
+    "Energy",
+    "Equal Opportunity",
+    "Financial Markets and Institutions",
+    "GAO Mission and Operations",
+    "Government Operations",
+    "Health Care",
+    "Homeland Security",
+    "Housing",
+    "Human Capital",
+    "Information Management",
+    "Information Security",
+    "Information Technology",
+    "International Affairs",
+    "Justice and Law Enforcement",
+    "National Defense",
+    "Natural Resources and Environment",
+    "Retirement Security",
+    "Science and Technology",
+    "Space",
+    "Tax Policy and Administration",
+    "Telecommunications",
+    "Transportation",
+    "Veterans",
+    "Worker and Family Assistance"
+]
+
+TOPIC_MAP = {
+    "AGRICULTURE AND FOOD": "Agriculture and Food",
+    "AUDITING AND FINANCIAL MANAGEMENT": "Auditing and Financial Management",
+    "BUDGET AND SPENDING": "Budget and Spending",
+    "BUSINESS REGULATION AND CONSUMER PROTECTION": "Business Regulation and Consumer Protection",
+    "ECONOMIC DEVELOPMENT": "Economic Development",
+    "EDUCATION": "Education",
+    "EMPLOYMENT": "Employment",
+    "ENERGY": "Energy",
+    "EQUAL OPPORTUNITY": "Equal Opportunity",
+    "FINANCIAL MARKETS AND INSTITUTIONS": "Financial Markets and Institutions",
+    "GOVERNMENT OPERATIONS": "Government Operations",
+    "HEALTH CARE": "Health Care",
+    "HOMELAND SECURITY": "Homeland Security",
+    "HOUSING": "Housing",
+    "HUMAN CAPITAL": "Human Capital",
+    "INFORMATION MANAGEMENT": "Information Management",
+    "INFORMATION SECURITY": "Information Security",
+    "INFORMATION TECHNOLOGY": "Information Technology",
+    "INTERNATIONAL AFFAIRS": "International Affairs",
+    "JUSTICE AND LAW ENFORCEMENT": "Justice and Law Enforcement",
+    "NATIONAL DEFENSE": "National Defense",
+    "NATURAL RESOURCES AND ENVIRONMENT": "Natural Resources and Environment",
+    "RETIREMENT SECURITY": "Retirement Security",
+    "SCIENCE AND TECHNOLOGY": "Science and Technology",
+    "SPACE": "Space",
+    "TAX POLICY AND ADMINISTRATION": "Tax Policy and Administration",
+    "TELECOMMUNICATIONS": "Telecommunications",
+    "TRANSPORTATION": "Transportation",
+    "VETERANS": "Veterans",
+    "WORKER AND FAMILY ASSISTANCE": "Worker and Family Assistance"
+}
+
+
+def normalize_topic_name(topic):
+    """Normalize topic name from markdown to official GAO format."""
+    if not topic:
+        return topic
+    return TOPIC_MAP.get(topic, topic)
+
+
+# =============================================================================
+# TOPIC BITMASKS
+# =============================================================================
+# Bit i stands for ALL_TOPICS[i]; a publication's topics fit in one 32-bit int
+TOPIC_BITS = {topic: 1 << bit for bit, topic in enumerate(ALL_TOPICS)}
+ALL_TOPICS_MASK = (1 << len(ALL_TOPICS)) - 1
+
+
+def topics_to_mask(topics):
+    """Split topics into (bitmask of official topics, list of any other topics)."""
+    mask = 0
+    extras = []
+    for topic in topics:
+        bit = TOPIC_BITS.get(topic)
+        if bit is None:
+            if topic not in extras:
+                extras.append(topic)
+        else:
+            mask |= bit
+    return mask, extras
+
+
+@functools.lru_cache(maxsize=4096)
+def mask_to_topics(mask):
+    """Official topics in a bitmask, in ALL_TOPICS order (as a tuple)."""
+    return tuple(topic for topic, bit in TOPIC_BITS.items() if mask & bit)
+
+
+def iter_bits(mask):
+    """Yield the set bits of a topic mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low
+        mask ^= low
@@ -0,0 +1,43 @@
+"""
+Fast-lane triage: which publications can keep their topics without a review
+"""
+from mir.topics import TOPIC_BITS, topics_to_mask
+
+
+def confident_masks(suggestions, threshold):
+    """Bitmask of the topics suggested at or above threshold, per publication."""
+    masks = []
+    for ranked in suggestions:
+        mask = 0
+        for topic, confidence in ranked:
+            if confidence >= threshold:
+                mask |= TOPIC_BITS.get(topic, 0)
+        masks.append(mask)
+    return masks
+
+
+def triage(table, suggestions=(), prior_assignments=None, threshold=0.8):
+    """(accepted, disputed) row indices of table, each in order.
+
+    A publication is accepted when nobody has edited its topics yet and they
+    agree exactly with either its earlier reviewed assignment
+    (prior_assignments: GAO number -> archive record) or the suggestions at
+    or above threshold. Publications with topics outside ALL_TOPICS always
+    need a review.
+    """
+    prior_assignments = prior_assignments or {}
+    suggested = confident_masks(suggestions, threshold)
+    suggested.extend([0] * (len(table) - len(suggested)))
+    unofficial = set(table.extra_topic_rows())
+
+    accepted, disputed = [], []
+    for index, (original, assigned, suggested_mask) in enumerate(
+            zip(table.original_masks, table.assigned_masks, suggested)):
+        agrees = False
+        if original == assigned and original and index not in unofficial:
+            agrees = suggested_mask == original
+            if not agrees:
+                prior = prior_assignments.get(table.gao_numbers[index])
+                agrees = prior is not None and topics_to_mask(prior['assigned_topics']) == (original, [])
+        (accepted if agrees else disputed).append(index)
+    return accepted, disputed
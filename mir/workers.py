@@ -0,0 +1,135 @@
+"""
+Shared conversion service: a bounded process pool with a FIFO queue
+"""
+import multiprocessing
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+
+from mir import settings
+from mir.cache import ConversionCache, make_key
+from mir.convert import cached_docx_markdown, convert_docx
+
+
+class ConversionJob:
+    """A queued or running conversion; shared by every caller uploading the same file."""
+
+    def __init__(self, key, data):
+        self.key = key
+        self.data = data
+        self.future = Future()
+
+    def wait(self, timeout=None):
+        """Return True once the job has finished (successfully or not)."""
+        done, _ = wait([self.future], timeout=timeout)
+        return bool(done)
+
+    def result(self):
+        """Markdown text, or re-raise the conversion error."""
+        return self.future.result()
+
+
+class ConversionService:
+    """Runs .docx conversions on at most max_workers processes at once.
+
+    Jobs wait in a FIFO queue until a slot frees up, so a burst of uploads
+    cannot oversubscribe the CPU. Submitting a file whose conversion is already
+    queued or running returns the existing job instead of starting another.
+    """
+
+    def __init__(self, cache=None, max_workers=None):
+        self.cache = cache
+        self.max_workers = max(1, max_workers or settings.CONVERSION_WORKERS)
+        # spawn: the Streamlit server is multi-threaded, so forking it is unsafe
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._waiting = deque()
+        self._running = 0
+
+    def cached(self, data):
+        """Return already-converted markdown for data, or None."""
+        if self.cache is None:
+            return None
+        return cached_docx_markdown(data, self.cache)
+
+    def submit(self, data):
+        """Queue a conversion of data, joining an identical in-flight job if there is one."""
+        key = make_key(data, settings.CONVERSION_ENGINE, settings.PANDOC_MODE)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                job = self._jobs[key] = ConversionJob(key, data)
+                self._waiting.append(job)
+                self._dispatch()
+        return job
+
+    def queue_position(self, job):
+        """1-based position among jobs waiting for a slot; 0 once running or done."""
+        with self._lock:
+            for position, waiting in enumerate(self._waiting, 1):
+                if waiting is job:
+                    return position
+        return 0
+
+    def stats(self):
+        """Current (running, waiting) job counts."""
+        with self._lock:
+            return self._running, len(self._waiting)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+    def _dispatch(self):
+        """Start waiting jobs while slots are free. Caller holds the lock."""
+        while self._waiting and self._running < self.max_workers:
+            job = self._waiting.popleft()
+            data, job.data = job.data, None
+            self._running += 1
+            future = self._executor.submit(_convert_in_worker, data,
+                                           settings.PANDOC_MODE, settings.CONVERSION_ENGINE)
+            future.add_done_callback(lambda f, job=job: self._finished(job, f))
+
+    def _finished(self, job, future):
+        with self._lock:
+            self._running -= 1
+            self._jobs.pop(job.key, None)
+            self._dispatch()
+        error = future.exception()
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(future.result())
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+_worker_cache = None
+
+
+class _PicklableCalledProcessError(subprocess.CalledProcessError):
+    """CalledProcessError that keeps stderr when sent back from a worker."""
+
+    def __reduce__(self):
+        return (type(self), (self.returncode, self.cmd, self.output, self.stderr))
+
+
+def _convert_in_worker(data, mode, engine):
+    """Pool entry point. Results go to the shared disk cache for later lookups."""
+    global _worker_cache
+    if _worker_cache is None:
+        # Disk only: the parent process keeps the in-memory copy
+        _worker_cache = ConversionCache(settings.CACHE_DIR, max_memory_bytes=0,
+                                        max_disk_bytes=settings.CACHE_DISK_MB * 1024 * 1024)
+    try:
+        return convert_docx(data, cache=_worker_cache, mode=mode, engine=engine)
+    except subprocess.CalledProcessError as e:
+        raise _PicklableCalledProcessError(e.returncode, e.cmd, e.output, e.stderr) from None
@@ -1,10 +1,31 @@
 import streamlit as st
-import pandas as pd
+import streamlit.components.v1 as components
+import bisect
+import io
+import os
 import re
 import subprocess
-import tempfile
-import os
-from io import BytesIO
+import time
+import uuid
+
+from mir import settings
+from mir.autosave import apply_saved_state, encode_delta
+from mir.bulk import ADD, OPERATIONS, REMOVE, REPLACE, bulk_edit, edited_rows, select_rows
+from mir.cache import ConversionCache, make_key
+from mir.export import CsvExport, TopicIndex, create_markdown_output
+from mir.history import EditHistory, make_change, snapshot
+from mir.metrics import NULL_TIMER, MetricsRegistry, Timer
+from mir.parser import iter_publications
+from mir.table import PublicationTable
+from mir.topics import ALL_TOPICS, TOPIC_BITS
+from mir.triage import triage
+
+# Conversion (zipfile/xml), the process pool (multiprocessing), the session
+# store and archive (sqlite3), batch loading, diffs and the .docx writer are
+# imported where first used, so a cold start only pays for the upload screen.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+RUN_STARTED = time.perf_counter()
 
 # =============================================================================
 # PAGE CONFIGURATION
@@ -15,243 +36,82 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# =============================================================================
+# PROFILING (?profile=N or MIR_PROFILE_RUNS=N)
+# =============================================================================
+PROFILES_KEPT = settings.PROFILE_MAX_RUNS
+
+def finish_profile():
+    """Stop the capture of the current (or an interrupted previous) run and keep its files."""
+    capture = st.session_state.profile_capture
+    if capture is None:
+        return
+    st.session_state.profile_capture = None
+    from mir.profiling import prune_captures
+    try:
+        result = capture.stop()
+    except OSError:
+        return
+    # The directory is shared by every session; keep it as bounded as the list
+    prune_captures(settings.PROFILE_DIR, PROFILES_KEPT)
+    st.session_state.profile_results = ([result] + st.session_state.profile_results)[:PROFILES_KEPT]
+
+if 'profile_runs_left' not in st.session_state:
+    st.session_state.profile_runs_left = settings.PROFILE_RUNS
+    st.session_state.profile_capture = None
+    st.session_state.profile_results = []
+    st.session_state.profile_runs = 0
+    st.session_state.profile_prefix = uuid.uuid4().hex[:8]
+
+# A run that ended in st.rerun()/st.stop() never reached the end of the script
+finish_profile()
+
+if "profile" in st.query_params:
+    try:
+        # Bounded: tracemalloc traces the whole process while any session profiles
+        st.session_state.profile_runs_left = min(max(1, int(st.query_params["profile"] or 1)),
+                                                 settings.PROFILE_MAX_RUNS)
+    except ValueError:
+        st.session_state.profile_runs_left = 1
+    del st.query_params["profile"]
+
+if st.session_state.profile_runs_left > 0:
+    from mir.profiling import RunCapture
+    st.session_state.profile_runs_left -= 1
+    st.session_state.profile_runs += 1
+    st.session_state.profile_capture = RunCapture(
+        settings.PROFILE_DIR,
+        f"{st.session_state.profile_prefix}-run{st.session_state.profile_runs}"
+    ).start()
+
 # =============================================================================
 # CUSTOM CSS - EXACT AFR COPY
 # =============================================================================
-st.markdown("""
-<style>
-    /* Header styling - title and badge inline */
-    .header-row {
-        display: flex;
-        align-items: center;
-        gap: 15px;
-        margin-bottom: 10px;
-    }
-    .header-title {
-        color: #002147;
-        font-size: 2rem;
-        font-weight: 700;
-        margin: 0;
-    }
-    
-    /* Section header styling */
-    .section-header {
-        font-size: 1.3rem;
-        font-weight: 600;
-        color: #002147;
-        margin-bottom: 8px;
-    }
-    
-    /* Button styling to match AFR */
-    .stButton > button {
-        background-color: #3d6a99;
-        color: white;
-        border: none;
-        padding: 4px 12px;
-        border-radius: 4px;
-        font-weight: 500;
-        font-size: 0.9rem;
-    }
-    .stButton > button:hover {
-        background-color: #002147;
-        color: white;
-    }
-    
-    /* Success message styling */
-    .stSuccess {
-        margin-bottom: 8px;
-    }
-    
-    /* Sidebar - compressed */
-    [data-testid="stSidebar"] {
-        padding-top: 1rem !important;
-    }
-    [data-testid="stSidebar"] .element-container {
-        margin-bottom: 0.1rem !important;
-    }
-    [data-testid="stSidebar"] h2 {
-        font-size: 1.1rem !important;
-        margin-bottom: 0.25rem !important;
-        margin-top: 0 !important;
-    }
-    [data-testid="stSidebar"] p {
-        margin-bottom: 0.15rem !important;
-        margin-top: 0 !important;
-        font-size: 0.85rem !important;
-    }
-    [data-testid="stSidebar"] hr {
-        margin: 0.3rem 0 !important;
-    }
-    
-    /* File uploader */
-    [data-testid="stSidebar"] .stFileUploader {
-        margin-bottom: 0.15rem !important;
-    }
-    [data-testid="stSidebar"] .stFileUploader label {
-        font-size: 0.85rem !important;
-        font-weight: 500 !important;
-        margin-bottom: 0.2rem !important;
-        text-align: left !important;
-    }
-    [data-testid="stSidebar"] .stFileUploader section {
-        text-align: center !important;
-        display: block !important;
-    }
-    [data-testid="stSidebar"] .stFileUploader section button {
-        width: 100% !important;
-        display: block !important;
-    }
-    [data-testid="stSidebar"] .stFileUploader [data-testid="stFileUploaderFileName"] {
-        font-size: 0.85rem !important;
-        padding-top: 0.4rem !important;
-        padding-bottom: 0.4rem !important;
-    }
-    [data-testid="stSidebar"] .stFileUploader button {
-        padding: 0.35rem 0.5rem !important;
-        font-size: 0.85rem !important;
-        width: 100% !important;
-        text-align: center !important;
-        font-weight: 500 !important;
-        line-height: 1.5 !important;
-        min-height: 2.5rem !important;
-    }
-    
-    /* Custom status box */
-    [data-testid="stSidebar"] .custom-status-box {
-        background-color: #d4edda !important;
-        border: 1px solid #c3e6cb !important;
-        border-radius: 0.25rem !important;
-        color: #155724 !important;
-        padding: 0.35rem 0.5rem !important;
-        margin-bottom: 0.2rem !important;
-        margin-top: 0.15rem !important;
-        font-size: 0.85rem !important;
-        font-weight: 500 !important;
-        text-align: center !important;
-        line-height: 1.5 !important;
-        min-height: 2.5rem !important;
-        display: flex !important;
-        align-items: center !important;
-        justify-content: center !important;
-    }
-    
-    /* Download button */
-    [data-testid="stSidebar"] .stDownloadButton {
-        margin-top: 0.15rem !important;
-        margin-bottom: 0.15rem !important;
-    }
-    [data-testid="stSidebar"] .stDownloadButton button {
-        padding: 0.35rem 0.5rem !important;
-        font-size: 0.85rem !important;
-        width: 100% !important;
-        text-align: center !important;
-        font-weight: 500 !important;
-        line-height: 1.5 !important;
-        min-height: 2.5rem !important;
-    }
-    [data-testid="stSidebar"] .stDownloadButton button svg {
-        display: none !important;
-    }
-</style>
-
-<script>
-// Auto-save to localStorage after each publication
-function autoSaveToLocalStorage(publications, currentIndex) {
-    const saveData = {
-        publications: publications,
-        currentIndex: currentIndex,
-        timestamp: new Date().toISOString()
-    };
-    localStorage.setItem('gao_mir_autosave', JSON.stringify(saveData));
-    console.log('Auto-saved to localStorage:', currentIndex);
-}
-
-// Load from localStorage on page load
-function loadFromLocalStorage() {
-    const saved = localStorage.getItem('gao_mir_autosave');
-    if (saved) {
-        return JSON.parse(saved);
-    }
-    return null;
-}
-
-// Clear localStorage
-function clearAutoSave() {
-    localStorage.removeItem('gao_mir_autosave');
-    console.log('Auto-save cleared from localStorage');
-}
-</script>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def page_style():
+    """Page CSS from assets/style.css, read once per process."""
+    with open(os.path.join(APP_DIR, "assets", "style.css"), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+st.markdown(page_style(), unsafe_allow_html=True)
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
-ALL_TOPICS = [
-    "Agriculture and Food",
-    "Auditing and Financial Management",
-    "Budget and Spending",
-    "Business Regulation and Consumer Protection",
-    "Economic Development",
-    "Education",
-    "Employment",
-    "Energy",
-    "Equal Opportunity",
-    "Financial Markets and Institutions",
-    "GAO Mission and Operations",
-    "Government Operations",
-    "Health Care",
-    "Homeland Security",
-    "Housing",
-    "Human Capital",
-    "Information Management",
-    "Information Security",
-    "Information Technology",
-    "International Affairs",
-    "Justice and Law Enforcement",
-    "National Defense",
-    "Natural Resources and Environment",
-    "Retirement Security",
-    "Science and Technology",
-    "Space",
-    "Tax Policy and Administration",
-    "Telecommunications",
-    "Transportation",
-    "Veterans",
-    "Worker and Family Assistance"
-]
-
-TOPIC_MAP = {
-    "AGRICULTURE AND FOOD": "Agriculture and Food",
-    "AUDITING AND FINANCIAL MANAGEMENT": "Auditing and Financial Management",
-    "BUDGET AND SPENDING": "Budget and Spending",
-    "BUSINESS REGULATION AND CONSUMER PROTECTION": "Business Regulation and Consumer Protection",
-    "ECONOMIC DEVELOPMENT": "Economic Development",
-    "EDUCATION": "Education",
-    "EMPLOYMENT": "Employment",
-    "ENERGY": "Energy",
-    "EQUAL OPPORTUNITY": "Equal Opportunity",
-    "FINANCIAL MARKETS AND INSTITUTIONS": "Financial Markets and Institutions",
-    "GOVERNMENT OPERATIONS": "Government Operations",
-    "HEALTH CARE": "Health Care",
-    "HOMELAND SECURITY": "Homeland Security",
-    "HOUSING": "Housing",
-    "HUMAN CAPITAL": "Human Capital",
-    "INFORMATION MANAGEMENT": "Information Management",
-    "INFORMATION SECURITY": "Information Security",
-    "INFORMATION TECHNOLOGY": "Information Technology",
-    "INTERNATIONAL AFFAIRS": "International Affairs",
-    "JUSTICE AND LAW ENFORCEMENT": "Justice and Law Enforcement",
-    "NATIONAL DEFENSE": "National Defense",
-    "NATURAL RESOURCES AND ENVIRONMENT": "Natural Resources and Environment",
-    "RETIREMENT SECURITY": "Retirement Security",
-    "SCIENCE AND TECHNOLOGY": "Science and Technology",
-    "SPACE": "Space",
-    "TAX POLICY AND ADMINISTRATION": "Tax Policy and Administration",
-    "TELECOMMUNICATIONS": "Telecommunications",
-    "TRANSPORTATION": "Transportation",
-    "VETERANS": "Veterans",
-    "WORKER AND FAMILY ASSISTANCE": "Worker and Family Assistance"
-}
+CHANGES_PAGE_SIZE = 100
+OVERVIEW_PAGE_SIZE = 50
+OVERVIEW_STATUS = {"All": None, "Changed": "changed", "Unchanged": "unchanged"}
+
+# =============================================================================
+# COMPONENTS
+# =============================================================================
+@st.cache_resource
+def get_autosave_component():
+    """Browser autosave component, declared once per process."""
+    return components.declare_component(
+        "mir_autosave",
+        path=os.path.join(APP_DIR, "components", "autosave")
+    )
 
 # =============================================================================
 # SESSION STATE INITIALIZATION
@@ -262,143 +122,405 @@ if 'current_index' not in st.session_state:
     st.session_state.current_index = 0
 if 'loaded_file' not in st.session_state:
     st.session_state.loaded_file = None
+    st.session_state.source_count = 0
+if 'csv_export' not in st.session_state:
+    st.session_state.csv_export = None
+if 'topic_index' not in st.session_state:
+    st.session_state.topic_index = None
+if 'docx_export' not in st.session_state:
+    st.session_state.docx_export = None
+if 'overview_cache' not in st.session_state:
+    st.session_state.overview_cache = None
+if 'prior_assignments' not in st.session_state:
+    st.session_state.prior_assignments = {}
+    st.session_state.similar_cache = None
+    st.session_state.suggestions = []
+    st.session_state.suggestions_job = None
+if 'triage' not in st.session_state:
+    st.session_state.triage = None
+if 'history' not in st.session_state:
+    st.session_state.history = EditHistory(settings.HISTORY_STEPS, settings.HISTORY_CHANGES)
+if 'doc_key' not in st.session_state:
+    st.session_state.doc_key = None
+    st.session_state.resumed_events = 0
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if 'autosave_pending' not in st.session_state:
+    st.session_state.autosave_pending = set()
+    st.session_state.autosave_seq = 0
+    st.session_state.autosave_payload = None
+    st.session_state.autosave_sent_index = 0
+    st.session_state.autosave_clear_seq = 0
+    st.session_state.autosave_checked_doc = None
+
+if 'session_metrics' not in st.session_state:
+    st.session_state.session_metrics = MetricsRegistry() if settings.METRICS else None
+
+# =============================================================================
+# INSTRUMENTATION
+# =============================================================================
+@st.cache_resource
+def get_process_metrics():
+    """Process-wide timing histograms, shared by all sessions."""
+    return MetricsRegistry()
+
+def timed(name):
+    """Timer for a hot path, recorded per session and per process.
+    
+    A shared no-op unless MIR_METRICS is set, so instrumented code costs
+    nothing measurable in normal use.
+    """
+    if not settings.METRICS:
+        return NULL_TIMER
+    return Timer(name, (get_process_metrics(), st.session_state.session_metrics))
+
+def metrics_rows(registry):
+    """Timer summaries as table rows, in milliseconds."""
+    rows = []
+    for name, summary in registry.summaries().items():
+        rows.append({
+            'timer': name,
+            'count': summary['count'],
+            'mean ms': round(summary['mean'] * 1000, 2),
+            'p50 ms': round(summary['p50'] * 1000, 2),
+            'p95 ms': round(summary['p95'] * 1000, 2),
+            'max ms': round(summary['max'] * 1000, 2),
+        })
+    return rows
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
-def normalize_topic_name(topic):
-    """Normalize topic name from markdown to official GAO format."""
-    if not topic:
-        return topic
-    return TOPIC_MAP.get(topic, topic)
-
-def parse_markdown(content):
-    """Parse markdown content and extract publications."""
-    # Clean table formatting if present (some MIR docs are wrapped in tables)
-    raw_lines = content.split('\n')
-    cleaned_lines = []
-    for raw_line in raw_lines:
-        # Remove table cell markers: | | content | | becomes content
-        cleaned = raw_line.replace('| |', '').replace('|', '').strip()
-        if cleaned and not cleaned.startswith('+---') and not cleaned.startswith('='):
-            cleaned_lines.append(cleaned)
-    
-    lines = cleaned_lines
-    
-    current_topic = None
-    pubs_dict = {}
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        if re.match(r'^\*\*[A-Z][A-Z\s&]+\*\*\\$', line):
-            raw_topic = line.replace('**', '').replace('\\', '').strip()
-            current_topic = normalize_topic_name(raw_topic)
-            i += 1
-            continue
-        
-        if (line.startswith('**') and 
-            not re.match(r'^\*\*[A-Z][A-Z\s&]+\*\*\\$', line) and
-            'Month in Review' not in line and
-            'LEGAL PRODUCTS' not in line):
-            
-            # Collect title - may span multiple lines
-            # First line starts with **, subsequent lines may not
-            title_parts = []
-            in_title = True
-            
-            while i < len(lines) and in_title:
-                title_line = lines[i].strip()
-                
-                if not title_line:
-                    break
-                
-                # Check if this is the GAO metadata line (don't include in title)
-                if re.match(r'GAO-\d+-\d+', title_line):
-                    break
-                
-                # Remove markdown formatting
-                clean = title_line.replace('**', '').replace('\\', '').strip()
-                
-                if clean:  # Only add non-empty parts
-                    title_parts.append(clean)
-                
-                # Check if this line ends the title
-                if title_line.endswith('**\\'):
-                    i += 1
-                    break
-                
-                i += 1
-            
-            title = ' '.join(title_parts)
-            
-            gao_num = None
-            date = None
-            report_url = None
-            
-            while i < len(lines):
-                next_line = lines[i].strip()
-                if next_line:
-                    gao_match = re.search(r'(GAO-\d+-\d+),\s*(.+)', next_line)
-                    if gao_match:
-                        gao_num = gao_match.group(1)
-                        date = gao_match.group(2)
-                    
-                    url_match = re.search(r'https://www\.gao\.gov/products/(GAO-\d+-\d+)', next_line)
-                    if url_match:
-                        report_url = f"https://www.gao.gov/products/{url_match.group(1)}"
-                        break
-                i += 1
-            
-            if gao_num:
-                if gao_num in pubs_dict:
-                    if current_topic and current_topic not in pubs_dict[gao_num]['current_topics']:
-                        pubs_dict[gao_num]['current_topics'].append(current_topic)
+@st.cache_resource
+def get_conversion_cache():
+    """Process-wide cache of converted documents, shared by all sessions."""
+    return ConversionCache(
+        settings.CACHE_DIR,
+        max_memory_bytes=settings.CACHE_MEMORY_MB * 1024 * 1024,
+        max_disk_bytes=settings.CACHE_DISK_MB * 1024 * 1024,
+    )
+
+@st.cache_resource
+def get_conversion_service():
+    """Process-wide conversion pool, or None when MIR_CONVERSION_WORKERS=0."""
+    if settings.CONVERSION_WORKERS <= 0:
+        return None
+    from mir.workers import ConversionService
+    return ConversionService(get_conversion_cache())
+
+def convert_upload(data):
+    """Convert .docx bytes to markdown lines, reporting queue position while waiting.
+    
+    Without a pool the lines are produced lazily, so most of the conversion
+    time shows up under the "parse" timer instead of "convert".
+    """
+    service = get_conversion_service()
+    if service is None:
+        from mir.convert import iter_docx_lines
+        with timed("convert"):
+            return iter_docx_lines(data, cache=get_conversion_cache())
+    
+    with timed("convert"):
+        markdown_content = service.cached(data)
+        if markdown_content is None:
+            job = service.submit(data)
+            status = st.empty()
+            while not job.wait(timeout=0.25):
+                position = service.queue_position(job)
+                if position:
+                    status.caption(f"Queued for conversion... position {position} in line")
                 else:
-                    pubs_dict[gao_num] = {
-                        'gao_number': gao_num,
-                        'title': title,
-                        'date': date,
-                        'current_topics': [current_topic] if current_topic else [],
-                        'report_url': report_url or f"https://www.gao.gov/products/{gao_num}",
-                        'notes': ''
-                    }
-        
-        i += 1
-    
-    publications = [pubs_dict[gao] for gao in sorted(pubs_dict.keys())]
-    return publications
-
-def create_markdown_output(publications, all_topics):
-    """Create markdown document from reviewed publications."""
-    md_lines = []
-    md_lines.append("**GAO Month in Review**\n")
-    md_lines.append("Month YYYY\\\n\\")
-    md_lines.append("")
-    
-    topics_dict = {}
-    for pub in publications:
-        assigned = pub.get('assigned_topics', pub['current_topics'])
-        for topic in assigned:
-            if topic not in topics_dict:
-                topics_dict[topic] = []
-            topics_dict[topic].append(pub)
-    
-    for topic in all_topics:
-        if topic not in topics_dict or not topics_dict[topic]:
-            continue
-        
-        md_lines.append(f"**{topic.upper()}**\\\n\\")
-        
-        pubs = sorted(topics_dict[topic], key=lambda x: x['title'])
-        
-        for pub in pubs:
-            md_lines.append(f"**{pub['title']}**\\")
-            md_lines.append(f"{pub['gao_number']}, {pub['date']}\n")
-            md_lines.append(f"-   Report: [https://www.gao.gov/products/{pub['gao_number']}](https://www.gao.gov/products/{pub['gao_number']})\n")
+                    status.caption("Converting document...")
+            status.empty()
+            markdown_content = job.result()
+        return markdown_content.split('\n')
+
+def load_publications(lines, source):
+    """Parse lines incrementally, previewing progress while the rest of the document loads."""
+    preview = st.empty()
+    pubs = []
+    with timed("parse"):
+        for pub in iter_publications(lines):
+            pub['sources'] = [source]
+            pubs.append(pub)
+            if len(pubs) == 1 or len(pubs) % 250 == 0:
+                preview.caption(f"Loaded {len(pubs)} publications... first: {pubs[0]['title']}")
+        preview.empty()
+        pubs.sort(key=lambda p: p['gao_number'])
+        return PublicationTable.from_records(pubs)
+
+def get_csv_export():
+    """Incremental CSV export for the loaded publications, created once per document."""
+    export = st.session_state.csv_export
+    if export is None or export.publications is not st.session_state.publications:
+        export = st.session_state.csv_export = CsvExport(st.session_state.publications)
+    return export
+
+def csv_bytes():
+    """Current CSV export (only changed rows are re-serialized)."""
+    with timed("csv_export"):
+        return get_csv_export().to_bytes()
+
+def markdown_text():
+    """Current Markdown export (rebuilt only after a change)."""
+    with timed("markdown_export"):
+        return create_markdown_output(st.session_state.publications, ALL_TOPICS, get_topic_index())
+
+def get_topic_index():
+    """Topic -> sorted publications index for the Markdown export, created once per document."""
+    topic_index = st.session_state.topic_index
+    if topic_index is None or topic_index.publications is not st.session_state.publications:
+        topic_index = st.session_state.topic_index = TopicIndex(st.session_state.publications)
+    return topic_index
+
+def get_docx_bytes():
+    """Reviewed Month in Review as .docx, rebuilt only when the topic index changed."""
+    topic_index = get_topic_index()
+    cached = st.session_state.docx_export
+    if cached is None or cached[0] is not topic_index or cached[1] != topic_index.version:
+        from mir.docx_export import create_docx_output
+        with timed("docx_export"):
+            data = create_docx_output(st.session_state.publications, ALL_TOPICS, topic_index)
+        cached = st.session_state.docx_export = (topic_index, topic_index.version, data)
+    return cached[2]
+
+def overview_matches(search, topics, status):
+    """Row indices for the overview filters, cached until topic assignments change."""
+    publications = st.session_state.publications
+    key = (publications, search, tuple(topics), status, get_topic_index().version)
+    cached = st.session_state.overview_cache
+    if cached is None or cached[0][0] is not publications or cached[0][1:] != key[1:]:
+        cached = st.session_state.overview_cache = (key, publications.search(search, topics, status))
+    return cached[1]
+
+def publications_changed(indices):
+    """Bring the incremental exports up to date after publications were edited."""
+    csv_export = get_csv_export()
+    topic_index = get_topic_index()
+    for index in indices:
+        csv_export.mark_changed(index)
+        topic_index.mark_changed(index)
+
+def save_publication(index, topics, notes, record=True):
+    """Store the reviewer's topics and notes for one publication.
     
-    return '\n'.join(md_lines)
+    Returns the history Change (None if nothing changed); record=False leaves
+    it for the caller to fold into a larger undo step.
+    """
+    pub = st.session_state.publications[index]
+    before = snapshot(st.session_state.publications, index)
+    pub['assigned_topics'] = topics
+    pub['notes'] = notes
+    change = make_change(index, before, snapshot(st.session_state.publications, index))
+    if change is not None and record:
+        st.session_state.history.record(f"Edit {pub['gao_number']}", [change])
+    publications_changed([index])
+    st.session_state.autosave_pending.add(index)
+    archive = get_archive()
+    if archive is not None:
+        archive.add_reviewed([pub], st.session_state.loaded_file)
+    return change
+
+def table_edited(indices, action):
+    """Record edits made straight on the table columns (bulk edits, undo/redo) everywhere a save goes."""
+    publications_changed(indices)
+    st.session_state.autosave_pending.update(indices)
+    pubs = st.session_state.publications
+    archive = get_archive()
+    if archive is not None:
+        archive.add_reviewed([pubs[index] for index in indices], st.session_state.loaded_file)
+    store = get_session_store()
+    if store is not None:
+        store.record_events(st.session_state.doc_key, st.session_state.session_id, action,
+                            [(index, pubs[index]) for index in indices],
+                            st.session_state.current_index)
+
+def undo_redo(apply, action):
+    """Undo or redo one history step, then follow the edited publication if it was just one."""
+    step = apply(st.session_state.publications)
+    if step is None:
+        return
+    indices = [change.index for change in step.changes]
+    if len(indices) == 1:
+        st.session_state.current_index = indices[0]
+    table_edited(indices, action)
+    st.rerun()
+
+@st.cache_resource
+def get_session_store():
+    """Process-wide durable session log, or None when disabled/unavailable."""
+    if not settings.SESSION_DB:
+        return None
+    import sqlite3
+    from mir.store import SessionStore
+    try:
+        return SessionStore(settings.SESSION_DB)
+    except (OSError, sqlite3.Error):
+        return None
+
+@st.cache_resource
+def get_archive():
+    """Process-wide cross-month publication archive, or None when disabled/unavailable."""
+    if not settings.ARCHIVE_DB:
+        return None
+    import sqlite3
+    from mir.archive import PublicationArchive
+    try:
+        return PublicationArchive(settings.ARCHIVE_DB)
+    except (OSError, sqlite3.Error):
+        return None
+
+def archive_document(pubs, source):
+    """Archive a loaded document; returns GAO number -> earlier reviewed record.
+    
+    Earlier assignments are looked up before the document is added, and ones
+    reviewed in this same document are left out.
+    """
+    archive = get_archive()
+    if archive is None:
+        return {}
+    with timed("archive_lookup"):
+        prior = archive.get_many(pubs.gao_numbers, reviewed_only=True)
+    archive.add_parsed(pubs, source)
+    return {gao: record for gao, record in prior.items() if record['source'] != source}
+
+@st.cache_resource
+def get_suggestion_service():
+    """Process-wide topic suggester, trained on the archive and past CSVs in the background."""
+    from mir.suggest import SuggestionService, load_training_records
+    archive = get_archive()
+    return SuggestionService(lambda: load_training_records(archive, settings.TRAINING_DIR),
+                             settings.SUGGEST_RETRAIN_SECONDS)
+
+def suggest_topics(pubs, doc_key):
+    """Start scoring suggestions for a loaded document; document_suggestions() collects them."""
+    archive = get_archive()
+    reviewed_count = archive.count(reviewed_only=True) if archive is not None else 0
+    return get_suggestion_service().submit(doc_key, pubs, reviewed_count)
+
+def document_suggestions(wait=False):
+    """Ranked (topic, confidence) suggestions per publication; [] until scored unless wait."""
+    job = st.session_state.suggestions_job
+    if job is not None and (wait or job.done()):
+        st.session_state.suggestions_job = None
+        try:
+            with timed("suggest_wait"):
+                st.session_state.suggestions = job.result()
+        except Exception as e:
+            st.warning(f"Topic suggestions unavailable: {e}")
+    return st.session_state.suggestions
+
+def update_triage(threshold):
+    """Split the document into accepted and queued publications for the fast lane.
+    
+    Runs once per document and threshold. If the current publication was
+    accepted, moves on to the next queued one.
+    """
+    triaged = st.session_state.triage
+    if triaged is not None and triaged['threshold'] == threshold:
+        return triaged
+    with st.spinner("Scoring topic suggestions..."):
+        suggestions = document_suggestions(wait=True)
+    accepted, queue = triage(st.session_state.publications, suggestions,
+                             st.session_state.prior_assignments, threshold)
+    triaged = st.session_state.triage = {'threshold': threshold, 'accepted': accepted, 'queue': queue}
+    index = st.session_state.current_index
+    if queue and index < len(st.session_state.publications) and index not in queue:
+        st.session_state.current_index = queue[min(bisect.bisect_left(queue, index), len(queue) - 1)]
+    return triaged
+
+def step_index(index, step):
+    """Publication after (step=1) or before (step=-1) index in review order; index itself at either end."""
+    if st.session_state.triage is None:
+        return min(max(index + step, 0), len(st.session_state.publications) - 1)
+    queue = st.session_state.triage['queue']
+    position = bisect.bisect_right(queue, index) if step > 0 else bisect.bisect_left(queue, index) - 1
+    return queue[position] if 0 <= position < len(queue) else index
+
+def next_index(index):
+    """Publication after index in review order; after the last one, the completion screen."""
+    following = step_index(index, 1)
+    return following if following != index else len(st.session_state.publications)
+
+def similar_publications(pub):
+    """Reviewed publications from other documents with titles like pub's (cached per publication)."""
+    cached = st.session_state.similar_cache
+    if cached is not None and cached[0] == pub['gao_number']:
+        return cached[1]
+    archive = get_archive()
+    rows = []
+    if archive is not None:
+        with timed("archive_similar"):
+            rows = [record for record in archive.similar(pub['title'], limit=6,
+                                                         exclude_source=st.session_state.loaded_file)
+                    if record['gao_number'] != pub['gao_number']][:5]
+    st.session_state.similar_cache = (pub['gao_number'], rows)
+    return rows
+
+def resume_session(doc_key):
+    """Stored (publications, current_index, event_count) for a document seen before, or None."""
+    store = get_session_store()
+    if store is None:
+        return None
+    with timed("session_resume"):
+        session = store.load_session(doc_key)
+    if session is None:
+        return None
+    records, current_index, event_count = session
+    return PublicationTable.from_records(records), current_index, event_count
+
+def log_review_event(action, index):
+    """Append a review action to the durable session log (non-blocking)."""
+    store = get_session_store()
+    if store is None:
+        return
+    store.record_event(
+        st.session_state.doc_key,
+        st.session_state.session_id,
+        action,
+        index,
+        st.session_state.publications[index],
+        st.session_state.current_index
+    )
+
+def sync_autosave():
+    """Send publications saved since the last rerun to the browser autosave.
+    
+    Only the changed records travel, compressed; the component merges them into
+    localStorage with a debounced write and reports the stored state back.
+    """
+    if (st.session_state.autosave_pending or
+            st.session_state.current_index != st.session_state.autosave_sent_index):
+        st.session_state.autosave_seq += 1
+        with timed("autosave_encode"):
+            st.session_state.autosave_payload = encode_delta(
+                st.session_state.publications,
+                st.session_state.autosave_pending,
+                st.session_state.current_index
+            )
+        st.session_state.autosave_sent_index = st.session_state.current_index
+        st.session_state.autosave_pending.clear()
+    
+    get_autosave_component()(
+        doc_key=st.session_state.doc_key,
+        payload=st.session_state.autosave_payload,
+        seq=st.session_state.autosave_seq,
+        clear_seq=st.session_state.autosave_clear_seq,
+        key="autosave",
+        default=None
+    )
+
+def saved_browser_state():
+    """Autosaved state for the loaded document, if the browser has one not yet handled."""
+    saved = st.session_state.get("autosave")
+    if not saved or saved.get('doc') != st.session_state.doc_key:
+        return None
+    if st.session_state.autosave_checked_doc == st.session_state.doc_key:
+        return None
+    state = saved.get('state')
+    if not state or not state.get('r'):
+        return None
+    return state
 
 # =============================================================================
 # SIDEBAR - File Upload
@@ -406,10 +528,11 @@ def create_markdown_output(publications, all_topics):
 with st.sidebar:
     st.header("Document Management")
     
-    uploaded_file = st.file_uploader(
+    uploaded_files = st.file_uploader(
         "Upload Month in Review", 
         type=['docx', 'md'],
-        help="Upload document (.docx or .md)",
+        accept_multiple_files=True,
+        help="Upload document (.docx or .md); upload several to review them as one queue",
     )
     
     if st.session_state.publications:
@@ -424,76 +547,168 @@ with st.sidebar:
         st.caption("✓ Auto-saved to browser after each publication")
         
         st.markdown(f"**File:** {st.session_state.loaded_file}")
+        if st.session_state.resumed_events:
+            st.caption(f"✓ Resumed previous session ({st.session_state.resumed_events} saved actions)")
+        
+        if st.toggle("⚡ Fast lane", key="fast_lane",
+                     help="Accept publications whose topics match an earlier review or confident "
+                          "suggestions, and review only the rest"):
+            confidence = st.slider("Suggestion confidence to accept (%)", 50, 100,
+                                   settings.TRIAGE_CONFIDENCE, 5, key="triage_confidence")
+            triaged = update_triage(confidence / 100)
+            st.caption(f"✓ {len(triaged['accepted'])} accepted as they are · "
+                       f"{len(triaged['queue'])} to review")
+        else:
+            st.session_state.triage = None
         
-        # Create CSV with current state
-        df_data = []
-        for pub in st.session_state.publications:
-            df_data.append({
-                'gao_number': pub['gao_number'],
-                'title': pub['title'],
-                'date': pub['date'],
-                'original_topics': ' | '.join(pub['current_topics']),
-                'assigned_topics': ' | '.join(pub.get('assigned_topics', pub['current_topics'])),
-                'notes': pub.get('notes', '')
-            })
+        history = st.session_state.history
+        col_undo, col_redo = st.columns(2)
+        with col_undo:
+            undo_label = history.undo_label()
+            if st.button("↶ Undo", disabled=undo_label is None, help=undo_label,
+                         use_container_width=True, key="undo_btn"):
+                undo_redo(history.undo, "undo")
+        with col_redo:
+            redo_label = history.redo_label()
+            if st.button("↷ Redo", disabled=redo_label is None, help=redo_label,
+                         use_container_width=True, key="redo_btn"):
+                undo_redo(history.redo, "redo")
         
-        df = pd.DataFrame(df_data)
-        csv = df.to_csv(index=False)
+        saved_state = saved_browser_state()
+        if saved_state:
+            st.info(f"Autosaved progress found: {len(saved_state['r'])} publications reviewed")
+            col_restore, col_discard = st.columns(2)
+            with col_restore:
+                if st.button("Restore", use_container_width=True, key="autosave_restore_btn"):
+                    _, index = apply_saved_state(st.session_state.publications, saved_state)
+                    st.session_state.current_index = index
+                    st.session_state.autosave_sent_index = index
+                    st.session_state.autosave_checked_doc = st.session_state.doc_key
+                    publications_changed(range(len(st.session_state.publications)))
+                    # Deltas recorded against the replaced state no longer apply
+                    st.session_state.history.clear()
+                    st.rerun()
+            with col_discard:
+                if st.button("Discard", use_container_width=True, key="autosave_discard_btn"):
+                    st.session_state.autosave_clear_seq += 1
+                    st.session_state.autosave_checked_doc = st.session_state.doc_key
+                    st.rerun()
         
         st.download_button(
             "⬇ Download Current Progress",
-            csv,
-            f"progress_{st.session_state.current_index + 1}_of_{len(st.session_state.publications)}.csv",
+            csv_bytes(),
+            f"progress_{min(st.session_state.current_index + 1, len(st.session_state.publications))}"
+            f"_of_{len(st.session_state.publications)}.csv",
             "text/csv",
             help="Manual backup - download work to your computer",
             use_container_width=True,
             key="download_progress_btn"
         )
+        
+        if st.session_state.current_index < len(st.session_state.publications):
+            if st.button("🏁 Finish: CSV, Markdown and DOCX", use_container_width=True,
+                         help="Go to the downloads of the reviewed document and the change view",
+                         key="finish_btn"):
+                st.session_state.current_index = len(st.session_state.publications)
+                st.rerun()
+        
+        if st.toggle("Audit log", key="audit_log_toggle",
+                     help="Every edit, undo and redo in this session, with topics before and after"):
+            st.download_button(
+                "⬇ Download Edit History",
+                st.session_state.history.to_jsonl(st.session_state.publications),
+                "review_edit_history.jsonl",
+                "application/jsonl",
+                use_container_width=True,
+                key="download_history_btn"
+            )
+            store = get_session_store()
+            if store is not None:
+                st.download_button(
+                    "⬇ Download Session Log",
+                    store.export_events(st.session_state.doc_key),
+                    "review_session_log.jsonl",
+                    "application/jsonl",
+                    help="Every review action on this document across sessions, from the session database",
+                    use_container_width=True,
+                    key="download_audit_btn"
+                )
 
 # =============================================================================
 # FILE PROCESSING
 # =============================================================================
-if uploaded_file and (not st.session_state.loaded_file or st.session_state.loaded_file != uploaded_file.name):
-    with st.spinner("Processing document..."):
-        markdown_content = None
+upload_name = ", ".join(f.name for f in uploaded_files) if uploaded_files else None
+if upload_name and st.session_state.loaded_file != upload_name:
+    with st.spinner("Processing document..." if len(uploaded_files) == 1 else
+                    f"Processing {len(uploaded_files)} documents..."):
+        if len(uploaded_files) == 1:
+            doc_key = make_key(uploaded_files[0].getvalue())[:32]
+        else:
+            doc_key = make_key(b'', *(make_key(f.getvalue()) for f in uploaded_files))[:32]
+        resumed = resume_session(doc_key)
         
-        if uploaded_file.name.endswith('.docx'):
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_docx:
-                tmp_docx.write(uploaded_file.read())
-                tmp_docx_path = tmp_docx.name
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.md') as tmp_md:
-                tmp_md_path = tmp_md.name
+        if resumed:
+            pubs, current_index, resumed_events = resumed
+        else:
+            current_index, resumed_events = 0, 0
+            markdown_lines = None
             
             try:
-                subprocess.run([
-                    'pandoc',
-                    '--track-changes=all',
-                    tmp_docx_path,
-                    '-o', tmp_md_path
-                ], check=True, capture_output=True)
-                
-                with open(tmp_md_path, 'r', encoding='utf-8') as f:
-                    markdown_content = f.read()
-                
-                os.unlink(tmp_docx_path)
-                os.unlink(tmp_md_path)
+                if len(uploaded_files) > 1:
+                    # Batch: convert and parse every file concurrently, merged by GAO number
+                    from mir.batch import load_documents
+                    with timed("load_batch"):
+                        pubs = PublicationTable.from_records(load_documents(
+                            [(f.name, f.getvalue()) for f in uploaded_files],
+                            cache=get_conversion_cache(),
+                            service=get_conversion_service()
+                        ))
+                else:
+                    uploaded_file = uploaded_files[0]
+                    if uploaded_file.name.endswith('.docx'):
+                        markdown_lines = convert_upload(uploaded_file.getvalue())
+                    elif uploaded_file.size:
+                        uploaded_file.seek(0)
+                        markdown_lines = io.TextIOWrapper(uploaded_file, encoding='utf-8')
+                    
+                    pubs = (load_publications(markdown_lines, uploaded_file.name)
+                            if markdown_lines is not None else None)
                 
             except subprocess.CalledProcessError as e:
-                st.error(f"Error converting document: {e.stderr.decode()}")
+                st.error(f"Error converting document: {(e.stderr or b'').decode()}")
                 st.stop()
             except FileNotFoundError:
                 st.error("Pandoc not found.")
                 st.info("For Streamlit Cloud: Ensure packages.txt contains 'pandoc'")
                 st.stop()
-        else:
-            markdown_content = uploaded_file.read().decode('utf-8')
+            except ValueError as e:
+                # Unreadable uploads: .md that isn't UTF-8, .docx neither engine can open
+                st.error(f"Error reading document: {e}")
+                st.stop()
+            
+            store = get_session_store()
+            if store is not None and pubs:
+                store.record_document(doc_key, upload_name, pubs)
         
-        if markdown_content:
-            pubs = parse_markdown(markdown_content)
+        if pubs is not None:
             st.session_state.publications = pubs
-            st.session_state.current_index = 0
-            st.session_state.loaded_file = uploaded_file.name
+            st.session_state.current_index = min(current_index, max(len(pubs) - 1, 0))
+            st.session_state.loaded_file = upload_name
+            st.session_state.source_count = len(pubs.source_names())
+            st.session_state.prior_assignments = archive_document(pubs, upload_name)
+            st.session_state.similar_cache = None
+            st.session_state.suggestions = []
+            st.session_state.suggestions_job = suggest_topics(pubs, doc_key)
+            st.session_state.triage = None
+            st.session_state.history = EditHistory(settings.HISTORY_STEPS, settings.HISTORY_CHANGES)
+            st.session_state.doc_key = doc_key
+            st.session_state.resumed_events = resumed_events
+            st.session_state.autosave_pending = set()
+            st.session_state.autosave_payload = None
+            st.session_state.autosave_sent_index = st.session_state.current_index
+            if resumed_events:
+                # The server log is authoritative; don't offer the browser copy too
+                st.session_state.autosave_checked_doc = doc_key
             st.rerun()
 
 # =============================================================================
@@ -527,33 +742,19 @@ elif st.session_state.current_index >= len(st.session_state.publications):
     
     st.markdown('<p class="section-header">Download Results</p>', unsafe_allow_html=True)
     
-    df_data = []
-    for pub in st.session_state.publications:
-        df_data.append({
-            'gao_number': pub['gao_number'],
-            'title': pub['title'],
-            'date': pub['date'],
-            'original_topics': ' | '.join(pub['current_topics']),
-            'assigned_topics': ' | '.join(pub.get('assigned_topics', pub['current_topics'])),
-            'notes': pub.get('notes', '')
-        })
-    
-    df = pd.DataFrame(df_data)
-    
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        csv = df.to_csv(index=False)
         st.download_button(
             "Download CSV",
-            csv,
+            csv_bytes(),
             "publications_reviewed.csv",
             "text/csv",
             use_container_width=True
         )
     
     with col2:
-        md_output = create_markdown_output(st.session_state.publications, ALL_TOPICS)
+        md_output = markdown_text()
         st.download_button(
             "Download Markdown",
             md_output,
@@ -563,6 +764,22 @@ elif st.session_state.current_index >= len(st.session_state.publications):
         )
     
     with col3:
+        st.download_button(
+            "Download DOCX",
+            get_docx_bytes(),
+            "month_review_updated.docx",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            use_container_width=True
+        )
+    
+    with col4:
+        if st.button("⬅ Back to Review", use_container_width=True, key="back_to_review_btn"):
+            count = len(st.session_state.publications)
+            last = step_index(count, -1)
+            st.session_state.current_index = last if last < count else max(count - 1, 0)
+            st.rerun()
+    
+    with col5:
         if st.button("Start New Review", use_container_width=True):
             st.session_state.publications = None
             st.session_state.current_index = 0
@@ -570,46 +787,75 @@ elif st.session_state.current_index >= len(st.session_state.publications):
             st.rerun()
     
     with st.expander("📊 View Changes"):
-        changes = []
-        for pub in st.session_state.publications:
-            orig = set(pub['current_topics'])
-            assigned = set(pub.get('assigned_topics', pub['current_topics']))
-            
-            added = assigned - orig
-            removed = orig - assigned
-            
-            for topic in added:
-                changes.append(f"➕ ADDED: {pub['gao_number']} → {topic}")
-            for topic in removed:
-                changes.append(f"➖ REMOVED: {pub['gao_number']} from {topic}")
+        from mir.diff import ADDED, REMOVED, change_rows, topic_summary
+        with timed("change_diff"):
+            changes = change_rows(st.session_state.publications)
         
         if changes:
             st.write(f"**{len(changes)} changes:**")
-            for change in changes:
-                st.text(change)
+            st.dataframe(topic_summary(st.session_state.publications), hide_index=True, use_container_width=True)
+            
+            col_topic, col_kind, col_search = st.columns([2, 1, 1])
+            with col_topic:
+                topic_filter = st.multiselect("Topic", ALL_TOPICS, key="changes_topic_filter")
+            with col_kind:
+                kind_filter = st.selectbox("Change", ["All", ADDED, REMOVED], key="changes_kind_filter")
+            with col_search:
+                search = st.text_input("GAO number or title", key="changes_search").strip().lower()
+            
+            if topic_filter:
+                changes = [c for c in changes if c['topic'] in topic_filter]
+            if kind_filter != "All":
+                changes = [c for c in changes if c['change'] == kind_filter]
+            if search:
+                changes = [c for c in changes if search in c['gao_number'].lower() or search in c['title'].lower()]
+            
+            page_count = max(1, -(-len(changes) // CHANGES_PAGE_SIZE))
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="changes_page")
+            start = (min(page, page_count) - 1) * CHANGES_PAGE_SIZE
+            st.dataframe(changes[start:start + CHANGES_PAGE_SIZE], hide_index=True, use_container_width=True)
+            st.caption(f"{len(changes)} matching changes · page {min(page, page_count)} of {page_count}")
         else:
             st.info("No changes made")
 
 else:
-    pub = st.session_state.publications[st.session_state.current_index]
+    index = st.session_state.current_index
+    pub = st.session_state.publications[index]
+    
+    # Fast lane: progress counts the review queue only
+    triaged = st.session_state.triage
+    if triaged is None:
+        position, total = st.session_state.current_index, len(st.session_state.publications)
+    else:
+        position, total = bisect.bisect_left(triaged['queue'], index), max(len(triaged['queue']), 1)
     
     # Progress info above progress bar (1-based counting for display)
-    progress_pct = int(((st.session_state.current_index + 1) / len(st.session_state.publications)) * 100)
+    progress_pct = int(((position + 1) / total) * 100)
     col_a, col_b = st.columns(2)
     with col_a:
-        st.caption(f"**Publications:** {len(st.session_state.publications)}")
+        if triaged is None:
+            st.caption(f"**Publications:** {len(st.session_state.publications)}")
+        else:
+            st.caption(f"**To review:** {len(triaged['queue'])} · {len(triaged['accepted'])} accepted")
     with col_b:
         # Show 1-based progress (publication 1 of 85, not 0 of 85)
-        current_pub_number = st.session_state.current_index + 1
-        st.caption(f"**Progress:** {current_pub_number} / {len(st.session_state.publications)} ({progress_pct}%)")
+        current_pub_number = position + 1
+        st.caption(f"**Progress:** {current_pub_number} / {total} ({progress_pct}%)")
     
     # Progress bar (0-based is fine for the bar itself)
-    progress = st.session_state.current_index / len(st.session_state.publications)
+    progress = min(position / total, 1.0)
     st.progress(progress)
+    if triaged is not None and not triaged['queue']:
+        st.info("Every publication was accepted in the fast lane; nothing left to review.")
     
     st.markdown(f'<div class="pub-card">', unsafe_allow_html=True)
     st.markdown(f'<div class="pub-title">{pub["title"]}</div>', unsafe_allow_html=True)
     st.markdown(f'<div class="pub-meta">{pub["gao_number"]} • {pub["date"]}</div>', unsafe_allow_html=True)
+    if st.session_state.source_count > 1:
+        st.caption(f"**Source:** {', '.join(pub['sources'])}")
+    prior = st.session_state.prior_assignments.get(pub['gao_number'])
+    if prior is not None:
+        st.caption(f"**Previously assigned** ({prior['source']}): {' | '.join(prior['assigned_topics'])}")
     
     # Just the Open Report button
     st.link_button("Open Report in Browser", pub['report_url'], use_container_width=False)
@@ -618,20 +864,29 @@ else:
     
     st.markdown('<p class="section-header">Select Topics</p>', unsafe_allow_html=True)
     
-    current_assigned = pub.get('assigned_topics', pub['current_topics'])
-    
     # ---- SANITIZE DEFAULT TOPICS BEFORE MULTISELECT ----
     current_assigned = pub.get('assigned_topics', pub['current_topics'])
 
     # Ensure only valid topics appear as defaults
-    valid_assigned = [t for t in current_assigned if t in ALL_TOPICS]
+    valid_assigned = [t for t in current_assigned if t in TOPIC_BITS]
 
-    selected_topics = st.multiselect(
-        "Select all applicable topics",
-        options=ALL_TOPICS,
-        default=valid_assigned,
-        label_visibility="collapsed"
-    )
+    suggestions = document_suggestions()
+    pub_suggestions = suggestions[index] if index < len(suggestions) else []
+    col_select, col_suggest = st.columns([3, 1]) if pub_suggestions else (st.container(), None)
+    
+    with col_select:
+        selected_topics = st.multiselect(
+            "Select all applicable topics",
+            options=ALL_TOPICS,
+            default=valid_assigned,
+            label_visibility="collapsed"
+        )
+    if col_suggest is not None:
+        with col_suggest:
+            st.caption("**Suggested**")
+            for topic, confidence in pub_suggestions:
+                mark = "✓ " if topic in selected_topics else ""
+                st.caption(f"{mark}{topic} · {confidence:.0%}")
  
     notes = st.text_area(
         "Notes (optional)",
@@ -643,42 +898,228 @@ else:
     col1, col2, col3 = st.columns([1, 1, 1.5])
     
     with col1:
-        if st.button("⬅ Previous", disabled=st.session_state.current_index == 0, use_container_width=True):
+        if st.button("⬅ Previous", disabled=step_index(index, -1) == index, use_container_width=True):
             # Save current publication's changes
-            st.session_state.publications[st.session_state.current_index]['assigned_topics'] = selected_topics
-            st.session_state.publications[st.session_state.current_index]['notes'] = notes
+            save_publication(st.session_state.current_index, selected_topics, notes)
             # Move to previous
-            st.session_state.current_index = max(0, st.session_state.current_index - 1)
+            st.session_state.current_index = step_index(index, -1)
+            log_review_event("previous", index)
             st.rerun()
     
     with col2:
         if st.button("No Changes →", use_container_width=True):
             # Save current publication's state (even if "no changes", user might have edited)
-            st.session_state.publications[st.session_state.current_index]['assigned_topics'] = selected_topics
-            st.session_state.publications[st.session_state.current_index]['notes'] = notes
-            # Move to next if not at end
-            if st.session_state.current_index < len(st.session_state.publications) - 1:
-                st.session_state.current_index += 1
+            save_publication(st.session_state.current_index, selected_topics, notes)
+            # Move to next, or to the downloads after the last one
+            st.session_state.current_index = next_index(index)
+            log_review_event("no_changes", index)
             st.rerun()
     
     with col3:
         if st.button("✓ Save & Next", type="primary", use_container_width=True):
             # Save current publication's changes
-            st.session_state.publications[st.session_state.current_index]['assigned_topics'] = selected_topics
-            st.session_state.publications[st.session_state.current_index]['notes'] = notes
-            # Move to next if not at end
-            if st.session_state.current_index < len(st.session_state.publications) - 1:
-                st.session_state.current_index += 1
+            save_publication(st.session_state.current_index, selected_topics, notes)
+            # Move to next, or to the downloads after the last one
+            st.session_state.current_index = next_index(index)
+            log_review_event("save_next", index)
             st.rerun()
     
-    # Auto-save to browser localStorage after any button click
-    import json
-    publications_json = json.dumps(st.session_state.publications)
-    st.components.v1.html(
-        f"""
-        <script>
-        autoSaveToLocalStorage({publications_json}, {st.session_state.current_index});
-        </script>
-        """,
-        height=0
-    )
+    similar = similar_publications(pub)
+    if similar:
+        with st.expander(f"🗂 Similar past publications ({len(similar)})"):
+            st.dataframe([{
+                'GAO number': record['gao_number'],
+                'title': record['title'],
+                'topics': ' | '.join(record['assigned_topics']),
+                'source': record['source'],
+            } for record in similar], hide_index=True, use_container_width=True)
+    
+    with st.expander("📋 All publications"):
+        col_search, col_topic, col_status = st.columns([2, 2, 1])
+        with col_search:
+            overview_search = st.text_input("GAO number or title", key="overview_search").strip()
+        with col_topic:
+            overview_topics = st.multiselect("Assigned topic", ALL_TOPICS, key="overview_topics")
+        with col_status:
+            overview_status = st.selectbox("Status", list(OVERVIEW_STATUS), key="overview_status")
+        
+        matches = overview_matches(overview_search, overview_topics, OVERVIEW_STATUS[overview_status])
+        page_count = max(1, -(-len(matches) // OVERVIEW_PAGE_SIZE))
+        overview_page = min(st.number_input("Page", min_value=1, max_value=page_count, value=1,
+                                            key="overview_page"), page_count)
+        page_rows = matches[(overview_page - 1) * OVERVIEW_PAGE_SIZE:overview_page * OVERVIEW_PAGE_SIZE]
+        
+        # Only the visible page is materialized
+        publications = st.session_state.publications
+        st.dataframe([{
+            '#': row + 1,
+            'GAO number': publications.gao_numbers[row],
+            'title': publications.titles[row],
+            'topics': ' | '.join(publications.assigned_topics(row)),
+            'changed': '✓' if publications.assigned_masks[row] != publications.original_masks[row] else '',
+            'current': '◀' if row == index else '',
+        } for row in page_rows], hide_index=True, use_container_width=True)
+        st.caption(f"{len(matches)} matching publications · page {overview_page} of {page_count}")
+        
+        if page_rows:
+            col_jump, col_go = st.columns([3, 1])
+            with col_jump:
+                jump_row = st.selectbox(
+                    "Jump to",
+                    page_rows,
+                    format_func=lambda row: (f"#{row + 1} · {publications.gao_numbers[row]} · "
+                                             f"{publications.titles[row][:70]}"),
+                    key="overview_jump",
+                    label_visibility="collapsed"
+                )
+            with col_go:
+                if st.button("Open", use_container_width=True, key="overview_open_btn"):
+                    # Keep the edits made to the current publication, as Previous does
+                    save_publication(index, selected_topics, notes)
+                    st.session_state.current_index = jump_row
+                    log_review_event("jump", index)
+                    st.rerun()
+    
+    with st.expander("🧰 Bulk edit"):
+        col_pattern, col_from, col_to, col_has = st.columns([2, 1, 1, 2])
+        with col_pattern:
+            bulk_pattern = st.text_input("Title matches (regex)", key="bulk_pattern")
+        with col_from:
+            bulk_from = st.text_input("GAO number from", key="bulk_from").strip()
+        with col_to:
+            bulk_to = st.text_input("to", key="bulk_to").strip()
+        with col_has:
+            bulk_has = st.selectbox("Assigned topic", ["Any"] + ALL_TOPICS, key="bulk_has")
+        
+        try:
+            bulk_rows = select_rows(st.session_state.publications, bulk_pattern, bulk_from, bulk_to,
+                                    None if bulk_has == "Any" else bulk_has)
+        except re.error as e:
+            st.error(f"Invalid title pattern: {e}")
+            bulk_rows = []
+        
+        col_op, col_topic, col_with = st.columns([1, 2, 2])
+        with col_op:
+            bulk_operation = st.selectbox("Operation", OPERATIONS, key="bulk_operation")
+        with col_topic:
+            bulk_topic = st.selectbox("Topic", ALL_TOPICS, key="bulk_topic")
+        with col_with:
+            bulk_replacement = st.selectbox("Replace with", ALL_TOPICS, key="bulk_replacement",
+                                            disabled=bulk_operation != REPLACE)
+        
+        action_text = {ADD: f"Add {bulk_topic} to", REMOVE: f"Remove {bulk_topic} from",
+                       REPLACE: f"Replace {bulk_topic} with {bulk_replacement} in"}[bulk_operation]
+        if st.button(f"{action_text} {len(bulk_rows)} selected publications", disabled=not bulk_rows,
+                     key="bulk_apply_btn"):
+            # Keep the edits made to the current publication first, as Open does;
+            # they are undone together with the bulk edit, as one step
+            saved = save_publication(index, selected_topics, notes, record=False)
+            changes = bulk_edit(st.session_state.publications, bulk_rows, bulk_operation,
+                                bulk_topic, bulk_replacement)
+            edited = edited_rows(changes, saved)
+            if edited:
+                table_edited(edited, "bulk")
+            label = (f"{action_text} {len(changes)} publications" if changes
+                     else f"Edit {st.session_state.publications.gao_numbers[index]}")
+            st.session_state.history.record(label, ([saved] if saved is not None else []) + changes)
+            st.rerun()
+    
+    if st.toggle("Preview updated Markdown", key="markdown_preview"):
+        st.code(markdown_text(), language="markdown")
+
+# =============================================================================
+# BROWSER AUTOSAVE
+# =============================================================================
+if st.session_state.publications:
+    sync_autosave()
+
+# =============================================================================
+# PROFILES
+# =============================================================================
+finish_profile()
+
+def read_capture_file(path):
+    """Bytes of a saved capture file, or None if it is gone."""
+    if not path:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+if st.session_state.profile_results:
+    with st.sidebar:
+        with st.expander("🔬 Profiles"):
+            # Capture files run to megabytes; only read them while downloads are wanted
+            profile_downloads = st.toggle("Download files", key="profile_downloads")
+            for number, result in enumerate(st.session_state.profile_results):
+                peak = result['peak_memory_bytes']
+                st.caption(f"**{result['label']}** · {result['seconds'] * 1000:.0f} ms"
+                           + (f" · peak {peak / 1e6:.1f} MB" if peak is not None else ""))
+                if not profile_downloads:
+                    continue
+                col_prof, col_alloc = st.columns(2)
+                profile_data = read_capture_file(result['profile_path'])
+                allocations_data = read_capture_file(result['allocations_path'])
+                with col_prof:
+                    if profile_data is not None:
+                        st.download_button(".prof", profile_data, os.path.basename(result['profile_path']),
+                                           "application/octet-stream", use_container_width=True,
+                                           key=f"profile_prof_{number}")
+                with col_alloc:
+                    if allocations_data is not None:
+                        st.download_button("Allocations", allocations_data,
+                                           os.path.basename(result['allocations_path']), "text/plain",
+                                           use_container_width=True, key=f"profile_alloc_{number}")
+            if st.session_state.profile_results[0]['summary']:
+                st.code(st.session_state.profile_results[0]['summary'], language=None)
+            st.caption(f"Saved in {settings.PROFILE_DIR}")
+
+# =============================================================================
+# TIMINGS (MIR_METRICS=1)
+# =============================================================================
+if settings.METRICS:
+    # Runs that end in st.rerun()/st.stop() never get here and aren't counted
+    run_seconds = time.perf_counter() - RUN_STARTED
+    process_metrics = get_process_metrics()
+    process_metrics.observe("script_run", run_seconds)
+    st.session_state.session_metrics.observe("script_run", run_seconds)
+    
+    if settings.METRICS_FILE:
+        try:
+            process_metrics.write_every(settings.METRICS_FILE, settings.METRICS_FILE_INTERVAL,
+                                        labels={'pid': os.getpid()})
+        except OSError:
+            pass
+    
+    with st.sidebar:
+        with st.expander("⏱ Timings"):
+            scope = st.radio("Scope", ["This session", "All sessions"], horizontal=True,
+                             key="metrics_scope", label_visibility="collapsed")
+            registry = (st.session_state.session_metrics if scope == "This session"
+                        else process_metrics)
+            rows = metrics_rows(registry)
+            if rows:
+                st.dataframe(rows, hide_index=True, use_container_width=True)
+            else:
+                st.caption("Nothing timed yet.")
+            st.download_button(
+                "Prometheus text",
+                registry.to_prometheus(labels={'pid': os.getpid()}),
+                "mir_timings.prom",
+                "text/plain",
+                use_container_width=True,
+                key="metrics_prometheus_btn"
+            )
+            st.download_button(
+                "JSON lines",
+                registry.to_jsonl(labels={'pid': os.getpid(), 'scope': scope}),
+                "mir_timings.jsonl",
+                "application/x-ndjson",
+                use_container_width=True,
+                key="metrics_jsonl_btn"
+            )
+            if st.button("Reset session timings", use_container_width=True, key="metrics_reset_btn"):
+                st.session_state.session_metrics.reset()
+                st.rerun()
@@ -0,0 +1,168 @@
+"""
+Regenerate the frozen baseline output in tests/fixtures from the original app
+
+    PYTHONPATH=. python tests/freeze_baseline.py [--commit 1506c1f]
+
+parse_markdown() and create_markdown_output() are taken verbatim from
+streamlit_app.py at the given commit, before they moved into mir; CSVs are
+written with pandas, as that app did. Needs git and pandas; the tests need
+neither. Only rerun this when the expected output is meant to change.
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+
+import pandas as pd
+
+from benchmarks.synthetic import build_sections, markdown_document
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BASELINE_COMMIT = '1506c1f'
+BASELINE_NAMES = ('ALL_TOPICS', 'TOPIC_MAP', 'normalize_topic_name', 'parse_markdown',
+                  'create_markdown_output')
+
+# Synthetic documents: name -> (publications, seed, table layout)
+SYNTHETIC = {
+    'synthetic_plain': (120, 11, False),
+    'synthetic_table': (60, 12, True),
+}
+DOCUMENTS = ('edge_cases',) + tuple(SYNTHETIC)
+
+# Notes a reviewer might type; commas, quotes and newlines exercise CSV quoting
+NOTES = ('Moved from the header topic', 'Check with editor, "urgent"', 'Line one\nLine two', '')
+
+
+def load_baseline(commit):
+    """The module-level names the baseline parser and exporter need, by name."""
+    source = subprocess.run(['git', 'show', f'{commit}:streamlit_app.py'], check=True,
+                            capture_output=True, text=True).stdout
+    tree = ast.parse(source)
+    wanted = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            names = [node.name]
+        elif isinstance(node, ast.Assign):
+            names = [target.id for target in node.targets if isinstance(target, ast.Name)]
+        else:
+            continue
+        if any(name in BASELINE_NAMES for name in names):
+            wanted.append(node)
+    namespace = {'re': re}
+    exec(compile(ast.Module(body=wanted, type_ignores=[]), 'baseline', 'exec'), namespace)
+    return namespace
+
+
+def review_plan(records, all_topics):
+    """Deterministic review of a document, as {'edits': [...], 'bulk': {...}}.
+
+    Every other publication of a short document (every 5th of a long one) gets
+    one topic toggled, as the topic picker does it (a new topic goes last, so
+    the result need not be in ALL_TOPICS order), and new notes. Publications
+    whose topics the document lists out of ALL_TOPICS order lose their first
+    topic instead, turning back to ALL_TOPICS order. Then one bulk add over
+    titles matching a pattern.
+    """
+    step = 2 if len(records) < 20 else 5
+    edits = []
+    for position, pub in enumerate(records):
+        current = pub['current_topics']
+        if len(current) > 1 and current != canonical_order(current, all_topics):
+            topics = current[1:]
+        elif position % step == 0:
+            toggled = all_topics[(position // step * 7) % len(all_topics)]
+            topics = ([topic for topic in current if topic != toggled]
+                      + ([toggled] if toggled not in current else []))
+            topics = topics or [all_topics[0]]
+        else:
+            continue
+        edits.append({
+            'gao_number': pub['gao_number'],
+            'assigned_topics': topics,
+            'notes': NOTES[len(edits) % len(NOTES)],
+        })
+    return {
+        'edits': edits,
+        'bulk': {'title_pattern': 'secur|veterans', 'operation': 'Add', 'topic': 'Space'},
+    }
+
+
+def canonical_order(topics, all_topics):
+    """Official topics in ALL_TOPICS order, then any others in their own order."""
+    return ([topic for topic in all_topics if topic in topics]
+            + [topic for topic in topics if topic not in all_topics])
+
+
+def apply_plan(records, plan, all_topics):
+    """The plan applied to baseline records the way the original app saved edits.
+
+    The original app had no bulk edit. A bulk-added topic takes its
+    ALL_TOPICS place, except in topics listed in document order (an unmapped
+    header first), where it goes last, as the topic picker appends it.
+    """
+    by_number = {pub['gao_number']: pub for pub in records}
+    for edit in plan['edits']:
+        pub = by_number[edit['gao_number']]
+        pub['assigned_topics'] = list(edit['assigned_topics'])
+        pub['notes'] = edit['notes']
+    bulk = plan['bulk']
+    pattern = re.compile(bulk['title_pattern'], re.IGNORECASE)
+    for pub in records:
+        assigned = pub.get('assigned_topics', pub['current_topics'])
+        if pattern.search(pub['title']) and bulk['topic'] not in assigned:
+            if assigned == canonical_order(assigned, all_topics):
+                pub['assigned_topics'] = canonical_order(assigned + [bulk['topic']], all_topics)
+            else:
+                pub['assigned_topics'] = assigned + [bulk['topic']]
+
+
+def csv_bytes(records):
+    df_data = []
+    for pub in records:
+        df_data.append({
+            'gao_number': pub['gao_number'],
+            'title': pub['title'],
+            'date': pub['date'],
+            'original_topics': ' | '.join(pub['current_topics']),
+            'assigned_topics': ' | '.join(pub.get('assigned_topics', pub['current_topics'])),
+            'notes': pub.get('notes', '')
+        })
+    return pd.DataFrame(df_data).to_csv(index=False).encode('utf-8')
+
+
+def write(name, data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    with open(os.path.join(FIXTURES, name), 'wb') as f:
+        f.write(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--commit', default=BASELINE_COMMIT)
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.commit)
+    all_topics = baseline['ALL_TOPICS']
+    for name, (count, seed, table) in SYNTHETIC.items():
+        write(f'{name}.md', markdown_document(build_sections(count, seed), table=table))
+
+    for name in DOCUMENTS:
+        with open(os.path.join(FIXTURES, f'{name}.md'), encoding='utf-8') as f:
+            content = f.read()
+        records = baseline['parse_markdown'](content)
+        write(f'{name}.records.json', json.dumps(records, indent=1, ensure_ascii=False) + '\n')
+        write(f'{name}.progress.csv', csv_bytes(records))
+
+        plan = review_plan(records, all_topics)
+        write(f'{name}.review.json', json.dumps(plan, indent=1, ensure_ascii=False) + '\n')
+        apply_plan(records, plan, all_topics)
+        write(f'{name}.reviewed.csv', csv_bytes(records))
+        write(f'{name}.reviewed.md', baseline['create_markdown_output'](records, all_topics))
+        print(f"{name}: {len(records)} publications, {len(plan['edits'])} edits")
+
+
+if __name__ == '__main__':
+    main()
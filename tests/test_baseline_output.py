@@ -0,0 +1,134 @@
+"""
+Regression tests against output frozen from the original app (see freeze_baseline.py)
+
+The parser, the CSV export and the markdown export were rewritten for speed on
+the promise that their output did not change; these compare them byte for
+byte with what streamlit_app.py produced before the rewrite, on a handcrafted
+edge-case document and two synthetic ones, before and after a scripted review.
+"""
+import io
+import json
+import os
+
+import pytest
+
+from mir.bulk import bulk_edit, select_rows
+from mir.export import CsvExport, TopicIndex, create_markdown_output
+from mir.history import EditHistory, make_change, snapshot
+from mir.parser import iter_publications, parse_markdown
+from mir.table import PublicationTable
+from mir.topics import ALL_TOPICS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+DOCUMENTS = ('edge_cases', 'synthetic_plain', 'synthetic_table')
+
+
+def fixture_text(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def fixture_bytes(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def load_table(document):
+    return PublicationTable.from_records(parse_markdown(fixture_text(f'{document}.md')))
+
+
+def review(table, plan, history=None, notify=()):
+    """Apply a freeze_baseline review plan to table, one history step per edit.
+
+    notify are callables given each changed row (CsvExport/TopicIndex.mark_changed).
+    """
+    rows = {gao_number: index for index, gao_number in enumerate(table.gao_numbers)}
+    for edit in plan['edits']:
+        index = rows[edit['gao_number']]
+        before = snapshot(table, index)
+        table.set_assigned_topics(index, edit['assigned_topics'])
+        table.notes[index] = edit['notes']
+        change = make_change(index, before, snapshot(table, index))
+        if history is not None and change is not None:
+            history.record('Save', [change])
+        for mark_changed in notify:
+            mark_changed(index)
+    bulk = plan['bulk']
+    changes = bulk_edit(table, select_rows(table, title_pattern=bulk['title_pattern']),
+                        bulk['operation'], bulk['topic'])
+    if history is not None:
+        history.record('Bulk edit', changes)
+    for index, _, _ in changes:
+        for mark_changed in notify:
+            mark_changed(index)
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+class TestBaselineOutput:
+
+    def test_parse_markdown(self, document):
+        expected = json.loads(fixture_text(f'{document}.records.json'))
+        assert parse_markdown(fixture_text(f'{document}.md')) == expected
+
+    def test_iter_publications_on_file_lines(self, document):
+        """Lines keeping their newlines, as read from a file or pandoc's stdout."""
+        expected = json.loads(fixture_text(f'{document}.records.json'))
+        lines = io.StringIO(fixture_text(f'{document}.md'))
+        records = sorted(iter_publications(lines), key=lambda pub: pub['gao_number'])
+        assert records == expected
+
+    def test_table_round_trip(self, document):
+        """The table gives back parsed records unchanged, topics in document order."""
+        expected = json.loads(fixture_text(f'{document}.records.json'))
+        assert PublicationTable.from_records(expected).to_records() == \
+            [dict(record, assigned_topics=record['current_topics'], sources=[])
+             for record in expected]
+
+    def test_csv_before_review(self, document):
+        assert CsvExport(load_table(document)).to_bytes() == fixture_bytes(f'{document}.progress.csv')
+
+    def test_csv_after_review(self, document):
+        table = load_table(document)
+        review(table, json.loads(fixture_text(f'{document}.review.json')))
+        assert CsvExport(table).to_bytes() == fixture_bytes(f'{document}.reviewed.csv')
+
+    def test_incremental_exports_after_review(self, document):
+        """Exports kept up to date with mark_changed() match fresh ones."""
+        table = load_table(document)
+        export = CsvExport(table)
+        topic_index = TopicIndex(table)
+        export.to_bytes()
+        topic_index.markdown()
+        review(table, json.loads(fixture_text(f'{document}.review.json')),
+               notify=(export.mark_changed, topic_index.mark_changed))
+        assert export.to_bytes() == fixture_bytes(f'{document}.reviewed.csv')
+        assert create_markdown_output(table, ALL_TOPICS, topic_index) == \
+            fixture_text(f'{document}.reviewed.md')
+
+    def test_markdown_after_review(self, document):
+        table = load_table(document)
+        review(table, json.loads(fixture_text(f'{document}.review.json')))
+        assert create_markdown_output(table, ALL_TOPICS) == fixture_text(f'{document}.reviewed.md')
+
+    def test_undo_redo_round_trip(self, document):
+        table = load_table(document)
+        export = CsvExport(table)
+        topic_index = TopicIndex(table)
+        history = EditHistory()
+        notify = (export.mark_changed, topic_index.mark_changed)
+        review(table, json.loads(fixture_text(f'{document}.review.json')), history, notify)
+
+        while (step := history.undo(table)) is not None:
+            for change in step.changes:
+                for mark_changed in notify:
+                    mark_changed(change.index)
+        assert export.to_bytes() == fixture_bytes(f'{document}.progress.csv')
+        assert CsvExport(table).to_bytes() == fixture_bytes(f'{document}.progress.csv')
+
+        while (step := history.redo(table)) is not None:
+            for change in step.changes:
+                for mark_changed in notify:
+                    mark_changed(change.index)
+        assert export.to_bytes() == fixture_bytes(f'{document}.reviewed.csv')
+        assert create_markdown_output(table, ALL_TOPICS, topic_index) == \
+            fixture_text(f'{document}.reviewed.md')
@@ -0,0 +1,29 @@
+"""
+Pruning of saved profile captures
+"""
+import os
+
+from mir.profiling import prune_captures
+
+
+def touch(path, modified):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('x')
+    os.utime(path, (modified, modified))
+
+
+def test_prune_keeps_newest_runs_with_both_files(tmp_path):
+    for run in range(8):
+        touch(tmp_path / f'20260101-00000{run}-abc-run{run}.prof', 1000 + run)
+        touch(tmp_path / f'20260101-00000{run}-abc-run{run}-allocations.txt', 1000 + run)
+    touch(tmp_path / 'notes.txt', 0)
+
+    prune_captures(str(tmp_path), 3)
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [f'20260101-00000{run}-abc-run{run}{suffix}'
+         for run in (5, 6, 7) for suffix in ('.prof', '-allocations.txt')] + ['notes.txt'])
+
+
+def test_prune_missing_directory_is_a_no_op(tmp_path):
+    prune_captures(str(tmp_path / 'missing'), 3)
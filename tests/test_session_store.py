@@ -0,0 +1,62 @@
+"""
+Resuming a review from the session store after edits the app logs in bulk
+"""
+import os
+
+from mir.bulk import ADD, bulk_edit, edited_rows, select_rows
+from mir.export import CsvExport
+from mir.history import make_change, snapshot
+from mir.parser import parse_markdown
+from mir.store import SessionStore
+from mir.table import PublicationTable
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+DOC_KEY = 'edge_cases'
+
+
+def load_table():
+    with open(os.path.join(FIXTURES, 'edge_cases.md'), encoding='utf-8') as f:
+        return PublicationTable.from_records(parse_markdown(f.read()))
+
+
+def bulk_apply(store, table, index, topics, notes, rows, topic):
+    """What the bulk edit button does: save the publication on screen, bulk edit, log both."""
+    before = snapshot(table, index)
+    table.set_assigned_topics(index, topics)
+    table.notes[index] = notes
+    saved = make_change(index, before, snapshot(table, index))
+    changes = bulk_edit(table, rows, ADD, topic)
+    edited = edited_rows(changes, saved)
+    if edited:
+        store.record_events(DOC_KEY, 'session', 'bulk', [(row, table[row]) for row in edited], index)
+    return edited
+
+
+def resumed_csv(store):
+    publications, _, _ = store.load_session(DOC_KEY)
+    return CsvExport(PublicationTable.from_records(publications)).to_bytes()
+
+
+def test_resume_after_bulk_edit_missing_current_row(tmp_path):
+    store = SessionStore(str(tmp_path / 'sessions.db'))
+    table = load_table()
+    store.record_document(DOC_KEY, 'edge_cases.md', table)
+    rows = select_rows(table, title_pattern='secur')
+    current = next(index for index in range(len(table)) if index not in rows)
+
+    edited = bulk_apply(store, table, current, ['Agriculture and Food'], 'Checked, "twice"',
+                        rows, 'Space')
+    assert edited[0] == current and sorted(edited[1:]) == rows
+    assert resumed_csv(store) == CsvExport(table).to_bytes()
+    store.close()
+
+
+def test_resume_after_bulk_edit_changing_nothing(tmp_path):
+    store = SessionStore(str(tmp_path / 'sessions.db'))
+    table = load_table()
+    store.record_document(DOC_KEY, 'edge_cases.md', table)
+    rows = table.rows_with_topic('Veterans')
+
+    assert bulk_apply(store, table, 0, ['Veterans'], 'Moved', rows, 'Veterans') == [0]
+    assert resumed_csv(store) == CsvExport(table).to_bytes()
+    store.close()
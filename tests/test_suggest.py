@@ -0,0 +1,114 @@
+"""
+Topic suggestions: quality on records with a learnable pattern, and bounded scoring work
+"""
+import random
+
+from mir.suggest import MIN_CONFIDENCE, SuggestionService, TopicSuggester
+
+COMMON = "federal agencies should improve oversight program management data".split()
+# Words that only ever appear in titles of publications assigned the topic
+DISTINCTIVE = {
+    "Veterans": "veterans benefits disability claims appeals".split(),
+    "Energy": "nuclear electricity pipeline grid reactor".split(),
+    "Space": "nasa launch satellite orbit lunar".split(),
+    "Health Care": "medicare medicaid hospital physician drug".split(),
+    "Transportation": "highway aviation railroad transit airport".split(),
+    "Education": "schools students teachers colleges loans".split(),
+}
+TOPICS = sorted(DISTINCTIVE)
+
+
+def make_records(count, seed, misfiled=0.3):
+    """Publications whose assigned topic shows in the title.
+
+    A misfiled share sits under another topic's header in the document.
+    """
+    rng = random.Random(seed)
+    records = []
+    for number in range(count):
+        topic = rng.choice(TOPICS)
+        words = rng.sample(DISTINCTIVE[topic], 2) + rng.sample(COMMON, 4)
+        rng.shuffle(words)
+        header = rng.choice(TOPICS) if rng.random() < misfiled else topic
+        records.append({
+            'gao_number': f'GAO-26-{100000 + number}',
+            'title': ' '.join(words).capitalize(),
+            'current_topics': [header],
+            'assigned_topics': [topic],
+        })
+    return records
+
+
+class CountingList(list):
+    """A posting list that counts the entries iterated over."""
+    scanned = 0
+
+    def __iter__(self):
+        for item in list.__iter__(self):
+            CountingList.scanned += 1
+            yield item
+
+
+def test_suggests_assigned_topic_over_document_header():
+    suggester = TopicSuggester(make_records(3000, seed=1))
+    held_out = make_records(300, seed=2)
+    top = [ranked[0][0] if ranked else None for ranked in suggester.suggest_many(held_out)]
+    correct = sum(1 for pub, topic in zip(held_out, top) if topic == pub['assigned_topics'][0])
+    assert correct / len(held_out) >= 0.9
+
+
+def test_original_topics_decide_when_titles_say_nothing():
+    records = [{'title': 'Federal agencies should improve oversight',
+                'current_topics': ['Energy'], 'assigned_topics': ['Natural Resources and Environment']}
+               for _ in range(50)]
+    records += [{'title': 'Federal agencies should improve oversight',
+                 'current_topics': ['Housing'], 'assigned_topics': ['Housing']}
+                for _ in range(50)]
+    suggester = TopicSuggester(records)
+    pub = {'title': 'Agencies should improve program data', 'current_topics': ['Energy']}
+    assert suggester.suggest(pub)[0] == ('Natural Resources and Environment', 1.0)
+
+
+def test_suggestion_limits():
+    suggester = TopicSuggester(make_records(500, seed=3))
+    for pub in make_records(50, seed=4):
+        ranked = suggester.suggest(pub, limit=2)
+        assert len(ranked) <= 2
+        assert all(MIN_CONFIDENCE <= confidence <= 1.0 for _, confidence in ranked)
+        assert [confidence for _, confidence in ranked] == \
+            sorted((confidence for _, confidence in ranked), reverse=True)
+    assert suggester.suggest({'title': 'Zzz qqq', 'current_topics': []}) == []
+    assert TopicSuggester([]).suggest_many([{'title': 'Veterans', 'current_topics': []}]) == [[]]
+
+
+def test_scoring_work_is_bounded_by_max_postings():
+    """Titles made only of words every training record has still scan a bounded share."""
+    suggester = TopicSuggester(make_records(5000, seed=5, misfiled=0), max_postings=300)
+    suggester.postings = {term: CountingList(posting) for term, posting in suggester.postings.items()}
+    pub = {'title': ' '.join(COMMON), 'current_topics': ['Energy']}
+    CountingList.scanned = 0
+    ranked = suggester.suggest(pub)
+    assert CountingList.scanned <= suggester.max_postings + suggester.k
+    assert ranked[0][0] == 'Energy'
+
+
+def test_service_scores_in_background_and_reuses_results():
+    loads = []
+
+    def load_records():
+        loads.append(1)
+        return make_records(500, seed=6)
+
+    service = SuggestionService(load_records, retrain_interval=3600)
+    document = make_records(40, seed=7)
+    first = service.submit('doc', document, reviewed_count=500)
+    assert service.submit('doc', document, reviewed_count=500) is first
+    assert first.result(timeout=30) == TopicSuggester(make_records(500, seed=6)).suggest_many(document)
+    # A changed reviewed count retrains only once retrain_interval has passed
+    assert service.submit('doc', document, reviewed_count=501) is first
+    service.retrain_interval = 0
+    second = service.submit('doc', document, reviewed_count=501)
+    assert second is not first
+    second.result(timeout=30)
+    assert len(loads) == 2
+    service.close()